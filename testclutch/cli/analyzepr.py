@@ -2,6 +2,7 @@
 
 import argparse
 import collections
+import concurrent.futures
 import datetime
 import enum
 import logging
@@ -510,6 +511,8 @@ class GatherPRAnalysis:
         self.ds = ds
         self.args = args
         self.analysisstate = prdef.PRAnalysisState()
+        # Maximum number of runs of a single PR to ingest at once
+        self.ingest_workers = config.get('pr_ingest_workers')  # type: int
 
     def read_analyses(self, lock: bool) -> dict[int, prdef.PRAnalysis]:
         """Return the analyses so far for this repo.
@@ -568,21 +571,30 @@ class GatherPRAnalysis:
         for pr in prs:
             if pr not in pranalyses or self.args.rerun:
                 logging.info(f'Starting new analysis of PR #{pr}')
-                thispr = prdef.PRAnalysis(
+                pranalyses[pr] = prdef.PRAnalysis(
                     pr, self.args.checkrepo,
                     int(datetime.datetime.now(tz=datetime.timezone.utc).timestamp()),
                     {}, {}, {}, {}, 0)
-                pranalyses[pr] = thispr
-            else:
-                thispr = pranalyses[pr]
 
-            # For any new PRs we haven't seen before, look up which tests failed
-            if origin not in thispr.failed:
-                failed, commit = self.gather_failed(origin, pr)
+        # For any new PRs we haven't seen before, look up which tests failed.
+        # This is mostly spent waiting on the CI service, so do several PRs at once.
+        newprs = [pr for pr in prs if origin not in pranalyses[pr].failed]
+        gather_workers = max(1, min(config.get('pr_gather_workers'), len(newprs)))
+        # Only let one level of thread pool run in parallel to limit the total number of threads
+        # and of concurrent requests to the CI service. The runs of each PR are ingested one at a
+        # time while several PRs are gathered at once.
+        self.ingest_workers = config.get('pr_ingest_workers') if gather_workers == 1 else 1
+        with concurrent.futures.ThreadPoolExecutor(max_workers=gather_workers) as executor:
+            gathered = executor.map(lambda pr: self.gather_failed(origin, pr), newprs)
+            for pr, (failed, commit) in zip(newprs, gathered):
                 if failed is not None:
-                    thispr.failed[origin] = failed
-                    thispr.commit[origin] = commit
-            else:
+                    pranalyses[pr].failed[origin] = failed
+                    pranalyses[pr].commit[origin] = commit
+
+        newprset = set(newprs)
+        for pr in prs:
+            thispr = pranalyses[pr]
+            if pr not in newprset:
                 logging.debug(f'Already have failed list for PR#{pr} from {origin}')
 
             # Now, analyze flakiness & permafails for this origin ONLY if there is at least one
@@ -645,6 +657,7 @@ class GatherPRAnalysis:
 
     def circle_gather_pr_failures(self, pr: int) -> tuple[list[prdef.FailedTest], str]:
         ci = prcircleci.CircleAnalyzer(self.args.checkrepo, self.ds)
+        ci.ingest_workers = self.ingest_workers
         results = ci.gather_pr(pr)
         commit = results[0][0]['commit'] if results else ''
         assert isinstance(commit, str)  # satisfy pytype that this isn't int
@@ -666,6 +679,7 @@ class GatherPRAnalysis:
     def gha_gather_pr_failures(self, pr: int) -> tuple[list[prdef.FailedTest], str]:
         owner, project = urls.get_project_name(self.args)
         ghi = prgha.GithubAnalyzeJob(owner, project, gha.read_token(self.args.authfile), self.ds)
+        ghi.ingest_workers = self.ingest_workers
         results = ghi.gather_pr(pr)
         commit = results[0][0]['commit'] if results else ''
         assert isinstance(commit, str)  # satisfy pytype that this isn't int
@@ -197,8 +197,14 @@ def ingest_files(args: argparse.Namespace):
 
     extrameta = parse_meta(args)
 
-    for file in args.files:
-        meta, testcases = logparse.parse_log_file(file)
+    if len(args.files) > 1 and all(file is not sys.stdin for file in args.files):
+        # Parse all the files in parallel. The files are reopened by name in the worker
+        # processes, but they're still needed here for their metadata.
+        parsed = logparse.parse_log_paths(file.name for file in args.files)
+    else:
+        parsed = (logparse.parse_log_file(file) for file in args.files)
+
+    for file, (meta, testcases) in zip(args.files, parsed):
         meta['origin'] = args.origin
         meta['checkrepo'] = args.checkrepo
         absfn = os.path.abspath(file.name)
@@ -72,6 +72,16 @@ git_comment_encoding = 'UTF-8'
 # will cause absolutely no disk space increase for such files on such filesystems.
 compress_threshold_bytes = 128
 
+# zstd compression level for logs in the cache
+zstd_level = 3
+
+# Number of threads zstd uses to compress a single log; -1 uses as many as there are CPUs
+# and 0 compresses in the calling thread only.
+# This only applies when logs are compressed one at a time. When several logs are compressed at
+# once, as the CI ingestors do, one log is compressed per CPU and each uses only a single thread,
+# to avoid starting one thread per CPU for each of them.
+zstd_threads = -1
+
 # Report configuration: test_results_count
 # Number of failed tests for which to bother showing URLs (since that is slow)
 test_results_count_max_urls = 75
@@ -92,6 +102,14 @@ pr_gather_path = '{XDG_CACHE_HOME}/testclutchpr.dat'
 # This should be no less than pr_ready_age_hours_max to avoid duplicate comments.
 pr_gather_age_hours_max = 24 * 7  # 7 days
 
+# Maximum number of PRs whose CI logs are retrieved at once when gathering PR analysis data
+pr_gather_workers = 4
+
+# Maximum number of CI runs for a single PR whose logs are retrieved at once
+# When analyzepr gathers more than one PR at once (see pr_gather_workers), the runs of each PR are
+# retrieved one at a time instead, so that the number of concurrent requests stays bounded.
+pr_ingest_workers = 4
+
 # Set of origins on which to perform analysis (default is all supported origins)
 pr_comment_origins = frozenset()
 
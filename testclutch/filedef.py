@@ -5,10 +5,13 @@ from typing import Protocol
 
 
 class TextIOReadline(Protocol):
-    """A typing.TextIO class that provides only readline and seek methods."""
+    """A typing.TextIO class that provides only readline, seek and close methods."""
 
     def readline(self, size: int = -1) -> str:
         raise io.UnsupportedOperation
 
     def seek(self, offset: int, whence: int = 0) -> int:
         raise io.UnsupportedOperation
+
+    def close(self) -> None:
+        raise io.UnsupportedOperation
@@ -20,6 +20,9 @@ LOGSUBDIR = 'appveyor'
 
 AV_TIME_RE = re.compile(r'^(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(\.\d{1,7})([-+]\d\d):(\d\d)$')
 
+# Job statuses of completed runs
+COMPLETED_STATUSES = frozenset(('success', 'failed', 'cancelled'))
+
 
 class AppveyorIngestor:
     """Ingest logs from Appveyor."""
@@ -185,7 +188,7 @@ class AppveyorIngestor:
         # TODO: try to figure out how to filter by hours
         runs = self.av.get_runs(branch)
         for job in runs['builds']:
-            if job['status'] not in frozenset(('success', 'failed', 'cancelled')):
+            if job['status'] not in COMPLETED_STATUSES:
                 # Run is not complete; ignore it
                 skipped += 1
                 logging.debug('Job %s status is %s', job['buildId'], job['status'])
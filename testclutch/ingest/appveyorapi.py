@@ -54,7 +54,7 @@ class AppveyorApi:
             logging.debug('Retrieving runs from %s', url)
             with self.http.get(url, headers=self._standard_headers(), params=params) as resp:
                 resp.raise_for_status()
-                last_resp = json.loads(resp.text)
+                last_resp = json.loads(resp.content)
             if 'project' not in combined_resp:
                 combined_resp['project'] = last_resp['project']
             combined_resp['builds'].extend(last_resp['builds'])
@@ -72,7 +72,7 @@ class AppveyorApi:
         logging.debug('Retrieving run from %s', url)
         with self.http.get(url, headers=self._standard_headers(), params=params) as resp:
             resp.raise_for_status()
-            run_search = json.loads(resp.text)
+            run_search = json.loads(resp.content)
 
         build = run_search['builds'][0]
         if build['buildId'] != build_id:
@@ -92,7 +92,7 @@ class AppveyorApi:
         logging.debug('Retrieving run by version from %s', url)
         with self.http.get(url, headers=self._standard_headers()) as resp:
             resp.raise_for_status()
-            return json.loads(resp.text)
+            return json.loads(resp.content)
 
     def get_logs(self, job_id: str) -> tuple[str, str]:
         """Retrieve log file for a job."""
@@ -207,17 +207,25 @@ class AzureIngestor:
                         self.ingest_log(build_id, logs_tasks, meta)
 
     def download_log(self, build_id: int, tasks: Iterable[dict[str, Any]]):
-        for task in tasks:
-            log_id = task['log']['id']
-            newfn = self._log_file_path(build_id, log_id)
-            if logcache.in_cache(newfn):
-                logging.debug('Log file is in cache as %s', newfn)
-            else:
-                fn, ft = self.azure.get_logs(build_id, log_id)
-                logging.debug(f'fn {fn} type {ft}')
-                logging.debug('Moving file to %s', newfn)
-                logcache.move_into_cache_compressed(fn, newfn)
-        return newfn
+        logs = [(task['log']['id'], self._log_file_path(build_id, task['log']['id']))
+                for task in tasks]
+        cached = logcache.in_cache_many(newfn for _, newfn in logs)
+        # Compress all the downloaded logs at once at the end so they can be done in parallel
+        downloaded = []  # type: list[tuple[str, str]]
+        try:
+            for log_id, newfn in logs:
+                if cached[newfn]:
+                    logging.debug('Log file is in cache as %s', newfn)
+                else:
+                    fn, ft = self.azure.get_logs(build_id, log_id)
+                    logging.debug(f'fn {fn} type {ft}')
+                    logging.debug('Moving file to %s', newfn)
+                    downloaded.append((fn, newfn))
+        except BaseException:
+            # Don't leave the logs downloaded so far lying around in the temporary directory
+            logcache.discard_many(downloaded)
+            raise
+        logcache.move_many_into_cache_compressed(downloaded)
 
     def store_test_run(self, meta: TestMeta, testcases: TestCases):
         """Store the data about one test.
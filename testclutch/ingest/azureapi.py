@@ -58,7 +58,7 @@ class AzureApi:
             params['branchName'] = branch
         with self.http.get(url, headers=self._standard_headers(), params=params) as resp:
             resp.raise_for_status()
-            return json.loads(resp.text)
+            return json.loads(resp.content)
 
     def get_build(self, build_id: int) -> dict[str, Any]:
         """Returns info about a build."""
@@ -74,7 +74,7 @@ class AzureApi:
             # TODO: perhaps treat that one similarly here, but consider that 203 is not intended as
             # as an error code.
             resp.raise_for_status()
-            return json.loads(resp.text)
+            return json.loads(resp.content)
 
     def get_build_timelines(self, build_id: int) -> dict[str, Any]:
         """Returns timeline for a build."""
@@ -86,7 +86,7 @@ class AzureApi:
                   }
         with self.http.get(url, headers=self._standard_headers(), params=params) as resp:
             resp.raise_for_status()
-            return json.loads(resp.text)
+            return json.loads(resp.content)
 
     def get_logs(self, build_id: int, log_id: int) -> tuple[str, str]:
         url = LOGS_URL.format(organization=self.organization, project=self.project,
@@ -156,23 +156,34 @@ class CircleIngestor:
         the API used to get it.
         """
         newfn = ''
-        for step in job_steps:
-            action = step['actions'][0]
-            step_id = action['step']
-            newfn = self._log_file_path(build_run, step_id)
-            if logcache.in_cache(newfn):
-                logging.debug('Log file is in cache as %s', newfn)
-            else:
-                if GET_FULL_LOG:
-                    # Full log using private API (raw log)
-                    log_url = self.circle.make_log_url(build_run, step_id)
+        job_steps = list(job_steps)
+        cached = logcache.in_cache_many(self._log_file_path(build_run, step['actions'][0]['step'])
+                                        for step in job_steps)
+        # Compress all the downloaded logs at once at the end so they can be done in parallel
+        downloaded = []  # type: list[tuple[str, str]]
+        try:
+            for step in job_steps:
+                action = step['actions'][0]
+                step_id = action['step']
+                newfn = self._log_file_path(build_run, step_id)
+                if cached[newfn]:
+                    logging.debug('Log file is in cache as %s', newfn)
                 else:
-                    # Truncated log using public API (log wrapped in JSON)
-                    log_url = action['output_url']
-                fn, ft = self.circle.get_logs(log_url)
-                logging.debug(f'fn {fn} type {ft}')
-                logging.debug('Moving file to %s', newfn)
-                logcache.move_into_cache_compressed(fn, newfn)
+                    if GET_FULL_LOG:
+                        # Full log using private API (raw log)
+                        log_url = self.circle.make_log_url(build_run, step_id)
+                    else:
+                        # Truncated log using public API (log wrapped in JSON)
+                        log_url = action['output_url']
+                    fn, ft = self.circle.get_logs(log_url)
+                    logging.debug(f'fn {fn} type {ft}')
+                    logging.debug('Moving file to %s', newfn)
+                    downloaded.append((fn, newfn))
+        except BaseException:
+            # Don't leave the logs downloaded so far lying around in the temporary directory
+            logcache.discard_many(downloaded)
+            raise
+        logcache.move_many_into_cache_compressed(downloaded)
         return newfn
 
     def _log_file_path(self, build_run: int, step_id: str) -> str:
@@ -19,6 +19,9 @@ LOGSUBDIR = 'cirrus'
 
 SANITIZE_PATH_RE = re.compile(r'[^-\w+!@#%^&()]')
 
+# Build statuses of completed runs
+COMPLETED_STATUSES = frozenset(('ABORTED', 'FAILED', 'COMPLETED'))
+
 
 def sanitize_path(path: str) -> str:
     """Convert the given URL path into one that is not too problematic to have on a filesystem."""
@@ -59,7 +62,7 @@ class CirrusIngestor:
         rsp = self.cirrus.get_runs(branch)
         for run in rsp['data']['ownerRepository']['builds']['edges']:
             node = run['node']
-            if node['status'] not in frozenset(('ABORTED', 'FAILED', 'COMPLETED')):
+            if node['status'] not in COMPLETED_STATUSES:
                 # Run is not complete; ignore it
                 skipped += 1
                 logging.debug('Run %s status is %s', node['id'], node['status'])
@@ -141,21 +144,32 @@ class CirrusIngestor:
 
     def download_log(self, run_id: int, task_id: int, task_commands: Iterable[str]
                      ) -> Optional[str]:
-        for command_name in task_commands:
-            newfn = self._log_file_path(run_id, task_id, command_name)
-            if logcache.in_cache(newfn):
-                logging.debug('Log file is in cache as %s', newfn)
-            else:
-                try:
+        task_commands = list(task_commands)
+        cached = logcache.in_cache_many(self._log_file_path(run_id, task_id, command_name)
+                                        for command_name in task_commands)
+        # Compress all the downloaded logs at once at the end so they can be done in parallel
+        downloaded = []  # type: list[tuple[str, str]]
+        try:
+            for command_name in task_commands:
+                newfn = self._log_file_path(run_id, task_id, command_name)
+                if cached[newfn]:
+                    logging.debug('Log file is in cache as %s', newfn)
+                else:
                     fn, ft = self.cirrus.get_logs(task_id, command_name)
-                except cirrusapi.HTTPError as e:
-                    logging.error(e.args[0])
-                    if e.response.status_code == 404:
-                        return 'Log not found on server error'
-                    return 'Unknown error downloading log'
-                logging.debug(f'fn {fn} type {ft}')
-                logging.debug('Moving file to %s', newfn)
-                logcache.move_into_cache_compressed(fn, newfn)
+                    logging.debug(f'fn {fn} type {ft}')
+                    logging.debug('Moving file to %s', newfn)
+                    downloaded.append((fn, newfn))
+        except cirrusapi.HTTPError as e:
+            # Don't leave the logs downloaded so far lying around in the temporary directory
+            logcache.discard_many(downloaded)
+            logging.error(e.args[0])
+            if e.response.status_code == 404:
+                return 'Log not found on server error'
+            return 'Unknown error downloading log'
+        except BaseException:
+            logcache.discard_many(downloaded)
+            raise
+        logcache.move_many_into_cache_compressed(downloaded)
         return None
 
     def store_test_run(self, meta: TestMeta, testcases: TestCases):
@@ -17,6 +17,13 @@ DATA_TYPE = 'application/json'
 
 MAX_RETRIEVED = 1000  # Don't ever retrieve more than this number
 
+# Number of seconds for which a list of runs may be reused within the process
+RUNS_CACHE_SECONDS = 60
+
+# Shared between all CirrusApi objects so that analyzing several PRs needs only one lookup
+# The cached values are shared, so callers must not modify them.
+runs_cache = netreq.TimedCache(RUNS_CACHE_SECONDS)
+
 # GraphQL schema is at https://github.com/cirruslabs/cirrus-ci-web/blob/master/schema.gql
 # Retrieve a list of test runs
 RUNS_GRAPHQL = r"""
@@ -329,7 +336,8 @@ class CirrusApi:
                'branch': branch,
                'numbuilds': MAX_RETRIEVED
                }
-        return self.query_graphql(RUNS_GRAPHQL, var)
+        return runs_cache.get((self.platform, self.owner, self.repo, branch),
+                              lambda: self.query_graphql(RUNS_GRAPHQL, var))
 
     def get_run(self, run_id: int) -> dict[str, Any]:
         var = {'buildId': run_id
@@ -42,9 +42,11 @@ class MassagedLog(TextIO):
     def __init__(self, f):
         self.file_obj = f
 
-    def __getattr__(self, attr):
-        """Pass any other references to the file object."""
-        return getattr(self.file_obj, attr)
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self.file_obj.seek(offset, whence)
+
+    def close(self):
+        self.file_obj.close()
 
     def readline(self) -> str:
         l = self.file_obj.readline()
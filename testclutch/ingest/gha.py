@@ -9,7 +9,7 @@ import logging
 import posixpath
 import re
 import zipfile
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from testclutch import config
 from testclutch import db
@@ -26,6 +26,9 @@ DEFAULT_EXT = '.zip'  # simplifying assumption, that all log files are of this t
 LOGSUBDIR = 'gha'
 EVENT = 'push'  # only look at logs of this event type
 
+# Function called to store each parsed log
+StoreFunc = Callable[[TestMeta, TestCases], None]
+
 # Matches may fail if GHA does filename substitution on characters other that this
 KNOWN_LOG_FN_RE = re.compile(r'^[-a-zA-Z0-9 .@,_/(){}$]*$')
 
@@ -73,12 +76,16 @@ class GithubIngestor:
                      }
         logcache.create_dirs(LOGSUBDIR)
 
-    def ingest_a_run(self, run_id: int):
+    def ingest_a_run(self, run_id: int, store: Optional[StoreFunc] = None):
         logging.debug('Getting run %s', run_id)
         run = self.gh.get_run(run_id)
-        self.ingest_run(run)
+        self.ingest_run(run, store)
+
+    def ingest_run(self, run: dict[str, Any], store: Optional[StoreFunc] = None):
+        """Ingest all the logs of a run.
 
-    def ingest_run(self, run: dict[str, Any]):
+        store is called with each parsed log; it defaults to store_test_run.
+        """
         run_id = run['id']
 
         if run['status'] != 'completed':
@@ -110,7 +117,7 @@ class GithubIngestor:
         cimeta['runfinishtime'] = int(ghaapi.convert_time(run['updated_at']).timestamp())
 
         if self.download_log(run_id):
-            self.process_log_file(self._log_file_path(run_id), cimeta)
+            self.process_log_file(self._log_file_path(run_id), cimeta, store)
         else:
             logging.info('No logs available to ingest')
 
@@ -218,7 +225,9 @@ class GithubIngestor:
                 return job
         return {}
 
-    def process_log_file(self, fn: str, cimeta: TestMeta):
+    def process_log_file(self, fn: str, cimeta: TestMeta, store: Optional[StoreFunc] = None):
+        if store is None:
+            store = self.store_test_run
         try:
             log = zipfile.ZipFile(logcache.open_cache_file(fn, 'rb'))
         except zipfile.BadZipFile:
@@ -309,4 +318,4 @@ class GithubIngestor:
                     logging.debug('%s', l.strip())
                 logging.debug('')
 
-                self.store_test_run(meta, testcases)
+                store(meta, testcases)
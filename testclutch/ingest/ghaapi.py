@@ -18,26 +18,35 @@ HTTPError = netreq.HTTPError
 
 # See https://docs.github.com/en/rest?apiVersion=2022-11-28
 API_URL = 'https://api.github.com'
-BASE_URL = API_URL + '/repos/{owner}/{repo}/actions/{endpoint}'
-RUN_URL = BASE_URL + '/{run_id}'
-LOGS_URL = RUN_URL + '/logs'
-JOBS_URL = RUN_URL + '/jobs'
-PULLS_URL = API_URL + '/repos/{owner}/{repo}/pulls'
-PULL_URL = PULLS_URL + '/{pull_number}'
-COMMITS_URL = API_URL + '/repos/{owner}/{repo}/commits/{commit_id}/status'
-CHECKRUNS_URL = API_URL + '/repos/{owner}/{repo}/commits/{commit_id}/check-runs'
-COMMENTS_URL = API_URL + '/repos/{owner}/{repo}/issues/{issue_number}/comments'
+REPO_URL = API_URL + '/repos/{owner}/{repo}'
+# These paths are relative to REPO_URL
+RUNS_PATH = '/actions/runs'
+RUN_PATH = RUNS_PATH + '/{run_id}'
+LOGS_PATH = RUN_PATH + '/logs'
+JOBS_PATH = RUN_PATH + '/jobs'
+PULLS_PATH = '/pulls'
+PULL_PATH = PULLS_PATH + '/{pull_number}'
+COMMITS_PATH = '/commits/{commit_id}/status'
+CHECKRUNS_PATH = '/commits/{commit_id}/check-runs'
+COMMENTS_PATH = '/issues/{issue_number}/comments'
 API_VERSION = '2022-11-28'
 DATA_TYPE = 'application/vnd.github+json'
 
 MAX_RETRIEVED = 1000  # Don't ever retrieve more than this number (max. 1000)
 PAGINATION = 100      # Number to retrieve at once
 
+# Number of seconds for which a list of runs may be reused within the process
+RUNS_CACHE_SECONDS = 60
+
 # True to authenticate all API calls, not just log downloads. Needed to overcome low
 # unauthenticated rate limits. See
 # https://docs.github.com/en/rest/overview/resources-in-the-rest-api?apiVersion=2022-11-28#rate-limiting
 ALWAYS_AUTH = True
 
+# Shared between all GithubApi objects so that repeated branch run list queries need only one
+# lookup. The cached values are shared, so callers must not modify them.
+runs_cache = netreq.TimedCache(RUNS_CACHE_SECONDS)
+
 # Matches a time stamp that includes a time zone.
 # Unfortunately, sometimes GHA includes one and sometimes it doesn't.
 TIME_WITH_ZONE_RE = re.compile(r'^.{19}.*[-+]')
@@ -68,6 +77,19 @@ class GithubApi:
         self.repo = repo
         self.token = token
 
+        # The owner and repo never change, so fill them in once here, leaving only the
+        # per-call fields to be formatted
+        repo_url = REPO_URL.format(owner=owner, repo=repo)
+        self._runs_url = repo_url + RUNS_PATH
+        self._run_url = repo_url + RUN_PATH
+        self._logs_url = repo_url + LOGS_PATH
+        self._jobs_url = repo_url + JOBS_PATH
+        self._pulls_url = repo_url + PULLS_PATH
+        self._pull_url = repo_url + PULL_PATH
+        self._commits_url = repo_url + COMMITS_PATH
+        self._checkruns_url = repo_url + CHECKRUNS_PATH
+        self._comments_url = repo_url + COMMENTS_PATH
+
         # This should delay a total of 30+60+120+240+480 seconds before aborting
         # Oddly, GitHub uses 403 and not 429 for Client Error: rate limit exceeded
         # TODO: subclass Retry to override get_retry_after and support the
@@ -98,9 +120,10 @@ class GithubApi:
                              ) -> Union[dict[str, Any], list[Any]]:
         """Perform a paged HTTP get, combining all paged results in array.
 
-        The JSON response must have at least one array member if a dict, the last of which will be
-        used as the signal for completed paging when it is empty. The JSON response may also be a
-        single array.
+        Paging stops when the response has no "next" Link header. As a fallback for endpoints that
+        don't provide one, the JSON response must have at least one array member if a dict, the
+        last of which will be used as the signal for completed paging when it is empty. The JSON
+        response may also be a single array.
         Raises an exception in case of network error.
 
         Returns the Python equivalent of the JSON data structure (which will be a dict).
@@ -110,8 +133,9 @@ class GithubApi:
         useparams['page'] = 1
         combined = None
 
+        max_pages = MAX_RETRIEVED // PAGINATION
         done = False
-        while not done and useparams['page'] <= MAX_RETRIEVED / PAGINATION:
+        while not done and useparams['page'] <= max_pages:
             resp = self.http.get(url, headers=headers, params=useparams)
             resp.raise_for_status()
 
@@ -146,15 +170,21 @@ class GithubApi:
                 logging.error(f'Unexpected return type {type(j)} from API')
                 raise RuntimeError('Bad JSON type from GHA')
 
+            if 'next' not in resp.links:
+                # No more pages are available
+                done = True
             useparams['page'] += 1
 
         assert combined is not None  # since it hasn't raised an exception this must be true
         return combined
 
-    def get_runs(self, branch: Optional[str] = None, since: Optional[datetime.datetime] = None
-                 ) -> dict[str, Any]:
-        """Returns info about all recent workflow runs on GitHub Actions."""
-        url = BASE_URL.format(owner=self.owner, repo=self.repo, endpoint='runs')
+    def get_runs(self, branch: Optional[str] = None, since: Optional[datetime.datetime] = None,
+                 head_sha: Optional[str] = None) -> dict[str, Any]:
+        """Returns info about all recent workflow runs on GitHub Actions.
+
+        If head_sha is given, only runs on that commit are returned.
+        """
+        url = self._runs_url
         params = {'status': 'completed'}
         if branch:
             params['branch'] = branch
@@ -165,33 +195,44 @@ class GithubApi:
             params['event'] = 'pull_request'
         if since:
             params['created'] = '>' + since.isoformat()
+        if head_sha:
+            params['head_sha'] = head_sha
 
-        result = self._http_get_paged_json(url, headers=self._standard_headers(), params=params)
+        def fetch() -> Union[dict[str, Any], list[Any]]:
+            return self._http_get_paged_json(url, headers=self._standard_headers(), params=params)
+
+        if since or head_sha:
+            # Queries limited by a time or commit are practically never repeated, so don't cache
+            # them; only a branch's full run list is worth reusing. This means PR analysis, which
+            # always queries by commit, doesn't benefit from the cache.
+            result = fetch()
+        else:
+            result = runs_cache.get((url, tuple(sorted(params.items()))), fetch)
         assert isinstance(result, dict)
         return result
 
     def get_run(self, run_id: int) -> dict[str, Any]:
         """Returns info about a single workflow run on GitHub Actions."""
-        url = RUN_URL.format(owner=self.owner, repo=self.repo, endpoint='runs', run_id=run_id)
+        url = self._run_url.format(run_id=run_id)
         resp = self.http.get(url, headers=self._standard_headers())
         resp.raise_for_status()
         return json.loads(resp.text)
 
     def get_jobs(self, run_id: int) -> dict[str, Any]:
         """Returns info about the jobs in a workflow run on GitHub Actions."""
-        url = JOBS_URL.format(owner=self.owner, repo=self.repo, endpoint='runs', run_id=run_id)
+        url = self._jobs_url.format(run_id=run_id)
         result = self._http_get_paged_json(url, headers=self._standard_headers())
         assert isinstance(result, dict)
         return result
 
     def get_logs(self, run_id: int) -> tuple[str, str]:
-        url = LOGS_URL.format(owner=self.owner, repo=self.repo, endpoint='runs', run_id=run_id)
+        url = self._logs_url.format(run_id=run_id)
         with self.http.get(url, headers=self._standard_auth_headers(), stream=True) as resp:
             return netreq.download_file(resp, url)
 
     def get_pulls(self, state: str) -> list[Any]:
         """Returns info about pull requests."""
-        url = PULLS_URL.format(owner=self.owner, repo=self.repo)
+        url = self._pulls_url
         params = {'state': state}
         result = self._http_get_paged_json(url, headers=self._standard_headers(), params=params)
         assert isinstance(result, list)
@@ -199,14 +240,14 @@ class GithubApi:
 
     def get_pull(self, pr: int) -> dict[str, Any]:
         """Returns info about a pull request on GitHub Actions."""
-        url = PULL_URL.format(owner=self.owner, repo=self.repo, pull_number=pr)
+        url = self._pull_url.format(pull_number=pr)
         resp = self.http.get(url, headers=self._standard_headers())
         resp.raise_for_status()
         return json.loads(resp.text)
 
     def get_commit_status(self, commit: str) -> dict[str, Any]:
         """Returns the status of checks on a commit."""
-        url = COMMITS_URL.format(owner=self.owner, repo=self.repo, commit_id=commit)
+        url = self._commits_url.format(commit_id=commit)
         result = self._http_get_paged_json(url, headers=self._standard_headers())
         assert isinstance(result, dict)
         return result
@@ -217,7 +258,7 @@ class GithubApi:
         This requires one of the following fine-grained token permissions:
             "Checks" repository permissions (read)
         """
-        url = CHECKRUNS_URL.format(owner=self.owner, repo=self.repo, commit_id=commit)
+        url = self._checkruns_url.format(commit_id=commit)
         result = self._http_get_paged_json(url, headers=self._standard_headers())
         assert isinstance(result, dict)
         return result
@@ -229,7 +270,7 @@ class GithubApi:
             "Issues" repository permissions (write)
             "Pull requests" repository permissions (write)
         """
-        url = COMMENTS_URL.format(owner=self.owner, repo=self.repo, issue_number=issue_id)
+        url = self._comments_url.format(issue_number=issue_id)
         data = {'body': comment}
         resp = self.http.post(url, headers=self._standard_auth_headers(), data=json.dumps(data))
         resp.raise_for_status()
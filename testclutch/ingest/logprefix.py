@@ -14,42 +14,36 @@ class FixedPrefixedLog:
     def __init__(self, f: TextIOReadline, prefixlen: int):
         self.file_obj = f
         self.prefixlen = prefixlen
-
-    def __getattr__(self, attr: str):
-        """Pass any other references to the file object."""
-        return getattr(self.file_obj, attr)
+        # Bound method, to avoid the attribute lookup for every line
+        self._readline = f.readline
 
     def readline(self, size: int = -1) -> str:
-        l = self.file_obj.readline(size)
-        if l:
-            origl = l
-            l = l[self.prefixlen:]
-            if not l and origl.endswith('\n'):
-                # If the line is too short but isn't the last one, return an empty line
-                return '\n'
-
-        return l
+        l = self._readline(size)
+        # If the line is too short but isn't the last one, return an empty line
+        return l[self.prefixlen:] or ('\n' if l.endswith('\n') else '')
 
     def seek(self, offset: int, whence: int = 0) -> int:
-        """Satisfy pytype, even though the __getattr__ actually does the same thing."""
         return self.file_obj.seek(offset, whence)
 
+    def close(self):
+        self.file_obj.close()
+
 
 class RegexPrefixedLog:
     """TextIOWrapper that removes a matching regex at the head of every log line.
 
-    Lines that don't match are sent through unchanged.
+    The regex is only ever matched once, at the start of the line, whether or not it is anchored
+    with ^. Lines that don't match are sent through unchanged.
     """
     def __init__(self, f: TextIOReadline, regex: re.Pattern):
         self.file_obj = f
         self.regex = regex
-
-    def __getattr__(self, attr: str):
-        """Pass any other references to the file object."""
-        return getattr(self.file_obj, attr)
+        # Bound methods, to avoid the attribute lookups for every line
+        self._readline = f.readline
+        self._match = regex.match
 
     def readline(self, size: int = -1) -> str:
-        l = self.file_obj.readline(size)
+        l = self._readline(size)
         if not l:
             return l
 
@@ -59,8 +53,13 @@ class RegexPrefixedLog:
         # log files that happen to include something that looks like a timestamp, but since
         # these extended lines almost never happen in the first place (so far it seems only
         # those using cross-platform-actions/action), this isn't a big concern.
-        return self.regex.sub('', l)
+        # Only the head of the line is of interest, so a match and slice is used which is faster
+        # than a substitution as it never needs to search the rest of the line.
+        r = self._match(l)
+        return l[r.end():] if r else l
 
     def seek(self, offset: int, whence: int = 0) -> int:
-        """Satisfy pytype, even though the __getattr__ actually does the same thing."""
         return self.file_obj.seek(offset, whence)
+
+    def close(self):
+        self.file_obj.close()
@@ -2,6 +2,12 @@
 
 from testclutch.filedef import TextIOReadline
 
+# Line prefixes that indicate the start of an msbuild indented section
+MSBUILD_START = ('Microsoft (R) Build Engine', 'MSBuild version ')
+
+# Line prefix of the special msbuild escaping of warnings
+CUSTOMBUILD_WARNING = 'CUSTOMBUILD : warning :'
+
 
 class MsBuildLog:
     """Remove the indentation that msbuild adds to child output.
@@ -16,10 +22,8 @@ class MsBuildLog:
     def __init__(self, f: TextIOReadline):
         self.file_obj = f
         self.in_msbuild = False
-
-    def __getattr__(self, attr: str):
-        """Send everything else to the embedded file."""
-        return getattr(self.file_obj, attr)
+        # Bound method, to avoid the attribute lookup for every line
+        self._readline = f.readline
 
     def seek(self, offset: int, whence: int = 0):
         """Capture to seek to reset the state."""
@@ -28,19 +32,20 @@ class MsBuildLog:
             self.in_msbuild = False
         return self.file_obj.seek(offset, whence)
 
-    def readline(self, size: int = -1) -> str:
-        l = self.file_obj.readline(size)
-        if l.startswith('Microsoft (R) Build Engine') or l.startswith('MSBuild version '):
-            # Start of indented section
-            self.in_msbuild = True
+    def close(self):
+        self.file_obj.close()
 
-        elif self.in_msbuild:
+    def readline(self, size: int = -1) -> str:
+        l = self._readline(size)
+        if self.in_msbuild:
             # In indented section
+            # The indentation is checked first as it's by far the most common case once in the
+            # section, and an indented line can't also be the start of a section.
             if l.startswith('  '):
                 # Strip off indentation
                 return l[2:]
 
-            if l.startswith('CUSTOMBUILD : warning :'):
+            if l.startswith(CUSTOMBUILD_WARNING):
                 # This must be some kind of special msbuild escaping going on
                 return 'Warning' + l[22:]
 
@@ -59,4 +64,9 @@ class MsBuildLog:
             #      and not l.startswith('Copyright (C) Microsoft Corporation')
             #      and l.rstrip('\r\n')):
             #      self.in_msbuild = False
+
+        elif l.startswith(MSBUILD_START):
+            # Start of indented section
+            self.in_msbuild = True
+
         return l
@@ -1,6 +1,7 @@
 """Code to get GitHub pull request logs from results on Appveyor."""
 
 import logging
+from typing import Iterator
 
 from testclutch import config
 from testclutch.ingest import appveyor
@@ -24,28 +25,31 @@ class AppveyorAnalyzeJob(appveyor.AppveyorIngestor):
         """
         self.test_results.append((logmeta, testcases))
 
-    def _find_for_pr(self, pr: int) -> list[str]:
+    def _find_for_pr(self, pr: int) -> Iterator[str]:
         """Find runs for the given PR made within the given number of hours.
 
-        Returns runs for all commits on this PR (if there were runs for more than one) in reverse
+        Yields runs for all commits on this PR (if there were runs for more than one) in reverse
         chronological order (most recent first).
         """
         # Start with a list of ALL recent completed runs
         branch = config.expand('branch')
         runs = self.av.get_runs(branch)
+        # The PR ID is a string, so compare it as one rather than converting every one to int
+        pr_str = str(pr)
         # Only look at completed runs
-        return [job['version'] for job in runs['builds']
-                if (job['status'] in frozenset(('success', 'failed', 'cancelled'))
-                    and 'pullRequestId' in job and int(job['pullRequestId']) == pr)]
+        # The most selective tests are done first since most runs won't be for this PR
+        return (job['version'] for job in runs['builds']
+                if ('pullRequestId' in job and job['pullRequestId'] == pr_str
+                    and job['status'] in appveyor.COMPLETED_STATUSES))
 
     def gather_pr(self, pr: int) -> list[ParsedLog]:
         # Clear any earlier results and start again
         self.test_results = []
-        buildvers = self._find_for_pr(pr)
-        if not buildvers:
+        # Only look at the first (most recent) build found
+        buildver = next(self._find_for_pr(pr), None)
+        if buildver is None:
             logging.error('No Appveyor runs found for PR#%d', pr)
-        logging.info(f'Found {len(buildvers)} runs; only looking at the most recent one')
-        if buildvers:
-            # Only look at the first (most recent) build found
-            self.ingest_a_run_by_buildver(buildvers[0])
+        else:
+            logging.info('Only looking at the most recent run %s', buildver)
+            self.ingest_a_run_by_buildver(buildver)
         return self.test_results
@@ -1,6 +1,7 @@
 """Code to get GitHub pull request logs from results on Azure."""
 
 import logging
+from typing import Iterator
 
 from testclutch import config
 from testclutch.ingest import azure
@@ -27,10 +28,10 @@ class AzureAnalyzer(azure.AzureIngestor):
     def clear_test_results(self):
         self.test_results = []  # type: list[ParsedLog]
 
-    def _find_matching_runs(self, pr: int, hours: int) -> list[int]:
+    def _find_matching_runs(self, pr: int, hours: int) -> Iterator[int]:
         """Find runs for the given PR made within the given number of hours.
 
-        Returns runs for all commits on this PR (if there were runs for more than one) in reverse
+        Yields runs for all commits on this PR (if there were runs for more than one) in reverse
         chronological order (most recent first).
         """
         # Don't specify the branch in order to pick up PR runs
@@ -38,19 +39,25 @@ class AzureAnalyzer(azure.AzureIngestor):
         # could be compared to the branch we want, but 1) it seems to be JSON embedded in JSON, and
         # 2) we don't really care about the branch as long as the PR number matches.
         builds = self.azure.get_builds(None, hours)
-        return [build['id'] for build in builds['value']
-                if (build['status'] == 'completed' and 'pr.sourceSha' in build['triggerInfo']
-                    and int(build['triggerInfo']['pr.number']) == pr)]
+        # The PR number is a string, so compare it as one rather than converting every one to int
+        pr_str = str(pr)
+        # The most selective tests are done first since most runs won't be for this PR
+        return (build['id'] for build in builds['value']
+                if ('pr.sourceSha' in build['triggerInfo']
+                    and build['triggerInfo']['pr.number'] == pr_str
+                    and build['status'] == 'completed'))
 
     def gather_pr(self, pr: int) -> list[ParsedLog]:
         self.clear_test_results()
-        found = self._find_matching_runs(pr, config.get('pr_age_hours_default'))
-        if not found:
+        # Only look at the first (most recent) build found
+        found = next(self._find_matching_runs(pr, config.get('pr_age_hours_default')), None)
+        if found is None:
             # Nothing found recently; expand the search much longer
-            found = self._find_matching_runs(pr, config.get('pr_age_hours_max'))
+            found = next(self._find_matching_runs(pr, config.get('pr_age_hours_max')), None)
 
-        logging.info(f'Found {len(found)} runs; only looking at the most recent one')
-        if found:
-            # Only look at the first (most recent) build found
-            self.ingest_a_run(found[0])
+        if found is not None:
+            logging.info('Only looking at the most recent run %d', found)
+            self.ingest_a_run(found)
+        else:
+            logging.info('Found no runs')
         return self.test_results
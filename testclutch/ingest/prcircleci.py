@@ -1,7 +1,10 @@
 """Code to get GitHub pull request logs from results on Circle CI."""
 
+import collections
+import concurrent.futures
 import logging
 
+from testclutch import config
 from testclutch import urls
 from testclutch.ingest import circleci
 from testclutch.logdef import ParsedLog, TestCases, TestMeta
@@ -16,6 +19,8 @@ class CircleAnalyzer(circleci.CircleIngestor):
     def __init__(self, *args):
         super().__init__(*args)
         self.test_results = []  # type: list[ParsedLog]
+        # Maximum number of runs to ingest at once
+        self.ingest_workers = config.get('pr_ingest_workers')  # type: int
 
     def store_test_run(self, logmeta: TestMeta, testcases: TestCases):
         """Store test results in a list.
@@ -30,25 +35,31 @@ class CircleAnalyzer(circleci.CircleIngestor):
         Only return runs for the most recent commit, if there were runs for more than one.
         """
         # Start with a list of ALL recent completed runs
-        matchingpr = []
+        # The matching runs could cover more than one git commit if the user pushed several that
+        # were run separately, so group them by commit while keeping track of the commit handled
+        # by the most recent (highest numbered) build.
+        matchingpr = collections.defaultdict(list)
+        mostrecentbuild = -1
+        mostrecentcommit = ''
         runs = self.circle.get_runs()
         logging.debug('Search found %d runs', len(runs))
         for run in runs:
-            if (run['lifecycle'] == 'finished'
-                    and run['pull_requests']):
+            if (run['pull_requests']
+                    and run['lifecycle'] == 'finished'):
                 url = run['pull_requests'][0]['url']
                 build_pr = urls.url_pr(url)
                 if pr == build_pr:
-                    logging.debug('Found build %s on branch %s', run['build_num'], run['branch'])
-                    matchingpr.append((run['build_num'], run['vcs_revision']))
+                    build_num = run['build_num']
+                    logging.debug('Found build %s on branch %s', build_num, run['branch'])
+                    matchingpr[run['vcs_revision']].append(build_num)
+                    if build_num > mostrecentbuild:
+                        mostrecentbuild = build_num
+                        mostrecentcommit = run['vcs_revision']
 
-        # matchingpr now contains all runs for this PR, which could cover more than one git commit
-        # if the user pushed several that were run separately. Keep only the runs on the most recent
-        # commit by sorting by build ID and filtering for the commit handled by the most recent one.
+        # Keep only the runs on the most recent commit
         if matchingpr:
-            mostrecentcommit = max(matchingpr, key=lambda x: x[0])[1]
             logging.info(f'Only getting runs for the most recent commit {mostrecentcommit:.9}')
-            return [match[0] for match in matchingpr if match[1] == mostrecentcommit]
+            return matchingpr[mostrecentcommit]
         return []
 
     def gather_pr(self, pr: int) -> list[ParsedLog]:
@@ -56,6 +67,10 @@ class CircleAnalyzer(circleci.CircleIngestor):
         self.test_results = []
         builds = self._find_for_pr(pr)
         logging.info('Found %d runs for PR#%d', len(builds), pr)
-        for build in builds:
-            self.ingest_a_run(build)
+        # The runs are independent and mostly spent waiting on the network, so ingest several at
+        # once. Results are appended to test_results in whatever order they complete.
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.ingest_workers) as executor:
+            # list() is needed to raise any exceptions that happened in the threads
+            list(executor.map(self.ingest_a_run, builds))
         return self.test_results
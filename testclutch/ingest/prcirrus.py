@@ -1,6 +1,7 @@
 """Code to get GitHub pull request logs from results on Cirrus CI."""
 
 import logging
+from typing import Iterator
 
 from testclutch.ingest import cirrus
 from testclutch.logdef import ParsedLog, TestCases, TestMeta
@@ -26,26 +27,26 @@ class CirrusAnalyzer(cirrus.CirrusIngestor):
     def clear_test_results(self):
         self.test_results = []  # type: list[ParsedLog]
 
-    def _find_matching_runs(self, pr: int, branch: str) -> list[int]:
+    def _find_matching_runs(self, pr: int, branch: str) -> Iterator[int]:
         """Find runs for the given PR.
 
-        Returns runs for all commits on this PR (if there were runs for more than one) in reverse
+        Yields runs for all commits on this PR (if there were runs for more than one) in reverse
         chronological order (most recent first).
         """
-        matches = []
         rsp = self.cirrus.get_runs(branch)
         for run in rsp['data']['ownerRepository']['builds']['edges']:
             node = run['node']
-            if (node['status'] in frozenset(('ABORTED', 'FAILED', 'COMPLETED'))
-                    and node['pullRequest'] == pr):
-                matches.append(int(node['id']))
-        return matches
+            if (node['pullRequest'] == pr
+                    and node['status'] in cirrus.COMPLETED_STATUSES):
+                yield int(node['id'])
 
     def gather_pr(self, pr: int) -> list[ParsedLog]:
         self.clear_test_results()
-        found = self._find_matching_runs(pr, '')
-        logging.info(f'Found {len(found)} runs; only looking at the most recent one')
-        if found:
-            # Only look at the first (most recent) build
-            self.ingest_a_run(found[0])
+        # Only look at the first (most recent) build
+        found = next(self._find_matching_runs(pr, ''), None)
+        if found is not None:
+            logging.info('Only looking at the most recent run %d', found)
+            self.ingest_a_run(found)
+        else:
+            logging.info('Found no runs')
         return self.test_results
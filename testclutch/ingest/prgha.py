@@ -1,10 +1,11 @@
 """Code to get GitHub pull request logs from results on GitHub Actions."""
 
-import datetime
+import concurrent.futures
+import functools
 import logging
-from typing import Optional
 
 from testclutch import config
+from testclutch import netreq
 from testclutch.ingest import gha
 from testclutch.logdef import ParsedLog, TestCases, TestMeta
 
@@ -12,6 +13,13 @@ from testclutch.logdef import ParsedLog, TestCases, TestMeta
 # We're only interested in pull requests here
 PR_EVENT = 'pull_request'
 
+# Number of seconds for which a PR's head commit may be reused within the process.
+# This is kept short so that a force-push to the PR is noticed soon after.
+PR_HEAD_CACHE_SECONDS = 60
+
+# Shared between all GithubAnalyzeJob objects, since a new one is made for each PR analyzed
+pr_head_cache = netreq.TimedCache(PR_HEAD_CACHE_SECONDS)
+
 
 class GithubAnalyzeJob(gha.GithubIngestor):
     """GitHub PR log analyzer.
@@ -22,48 +30,45 @@ class GithubAnalyzeJob(gha.GithubIngestor):
     def __init__(self, *args):
         super().__init__(*args)
         self.clear_test_results()
+        # Maximum number of runs to ingest at once
+        self.ingest_workers = config.get('pr_ingest_workers')  # type: int
 
     def clear_test_results(self):
         self.test_results = []  # type: list[ParsedLog]
-        self.prmeta = {}        # type: TestMeta
 
     def _is_matching_run(self, run: TestMeta, commit: str) -> bool:
         return (run['event'] == PR_EVENT
                 and run['status'] == 'completed'
                 and run['head_sha'] == commit)
 
-    def _find_matching_runs(self, commit: str, since: Optional[datetime.datetime]) -> list[int]:
+    def _find_matching_runs(self, commit: str) -> list[int]:
         """Find all runs on PRs for a particular commit."""
         found = []
-        for run in self.gh.get_runs(since=since)['workflow_runs']:
+        # The server filters the runs by commit, so the check here is just a safety check
+        for run in self.gh.get_runs(head_sha=commit)['workflow_runs']:
             if self._is_matching_run(run, commit):
                 # Found a matching run
                 found.append(run['id'])
                 logging.debug('Found run %s from %s, %s', run['id'], run['created_at'], run['name'])
         return found
 
+    def _pr_head_sha(self, pr: int) -> str:
+        """Return the head commit of the PR.
+
+        This is cached for a short time.
+        """
+        return pr_head_cache.get((self.owner, self.repo, pr),
+                                 lambda: self.gh.get_pull(pr)['head']['sha'])
+
     def _find_for_pr(self, pr: int) -> list[int]:
         """Find the most recent runs for the given PR.
 
         Only return runs for the most recent commit, if there were runs for more than one.
         """
-        pr_info = self.gh.get_pull(pr)
-        commit = pr_info['head']['sha']
+        commit = self._pr_head_sha(pr)
         logging.debug(f'PR#{pr} is about commit {commit:.9}')
 
-        found = self._find_matching_runs(
-            commit,
-            since=datetime.datetime.now(tz=datetime.timezone.utc) - datetime.timedelta(
-                hours=config.get('pr_age_hours_default'))
-        )
-        if not found:
-            logging.info(f'No PR#{pr} runs found in the last {config.get("pr_age_hours_default")} '
-                         f'hours; trying again for {config.get("pr_age_hours_max")} hours')
-            found = self._find_matching_runs(
-                commit,
-                since=datetime.datetime.now(tz=datetime.timezone.utc) - datetime.timedelta(
-                    hours=config.get('pr_age_hours_max'))
-            )
+        found = self._find_matching_runs(commit)
         logging.debug('Found %d matching runs', len(found))
         return found
 
@@ -72,12 +77,18 @@ class GithubAnalyzeJob(gha.GithubIngestor):
 
         This overrides the method in the base class.
         """
-        meta = {**self.prmeta, **logmeta}
-        if meta['trigger'] != 'pull_request':
-            logging.info(f"Log is due to {meta['trigger']}, not a pull request; skipping")
+        self._store_pr_test_run({}, self.test_results, logmeta, testcases)
+
+    @staticmethod
+    def _store_pr_test_run(prmeta: TestMeta, results: list[ParsedLog],
+                           logmeta: TestMeta, testcases: TestCases):
+        """Store test results along with the PR metadata in the given list."""
+        # The trigger comes from the log, so check it before building the merged metadata
+        if logmeta['trigger'] != 'pull_request':
+            logging.info(f"Log is due to {logmeta['trigger']}, not a pull request; skipping")
             return
 
-        self.test_results.append((meta, testcases))
+        results.append(({**prmeta, **logmeta}, testcases))
 
     def gather_pr(self, pr: int) -> list[ParsedLog]:
         """Clear any earlier results and start gathering job results for this PR."""
@@ -85,8 +96,19 @@ class GithubAnalyzeJob(gha.GithubIngestor):
         runs = self._find_for_pr(pr)
         if not runs:
             logging.error('No GHA run found for PR#%d', pr)
-        # Look at all jobs in the most recent run
-        for run_id in runs:
-            self.prmeta = {'pullrequest': pr}
-            self.ingest_a_run(run_id)
+        self.test_results = self._ingest_pr_runs(pr, runs)
         return self.test_results
+
+    def _ingest_pr_runs(self, pr: int, runs: list[int]) -> list[ParsedLog]:
+        """Ingest the given runs for a PR and return their test results."""
+        # Look at all jobs in the most recent run
+        # The runs are independent and mostly spent waiting on the network, so ingest several at
+        # once. Results are appended to a list belonging to this call in whatever order they
+        # complete, so nothing the worker threads touch is shared through the object.
+        results = []  # type: list[ParsedLog]
+        store = functools.partial(self._store_pr_test_run, {'pullrequest': pr}, results)
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.ingest_workers) as executor:
+            # list() is needed to raise any exceptions that happened in the threads
+            list(executor.map(lambda run: self.ingest_a_run(run, store), runs))
+        return results
@@ -1,6 +1,7 @@
 """Debug logging functions."""
 
 import argparse
+import functools
 import logging
 import os
 import shlex
@@ -8,8 +9,12 @@ import sys
 from typing import Optional
 
 
+@functools.lru_cache(maxsize=None)
 def calling_program() -> str:
-    """Return the name of the program that started us."""
+    """Return the name of the program that started us.
+
+    This is cached since the program can't change while it's running.
+    """
     return os.path.basename(sys.argv[0])
 
 
@@ -30,16 +35,29 @@ def logging_level_to_syslog(level: int) -> int:
     return 1      # KERN_ALERT
 
 
-class SyslogFormatter(logging.Formatter):
-    """Formats log messages with a syslog-style level prefix."""
+class LogFormatter(logging.Formatter):
+    """Formats log messages with a fixed program prefix.
+
+    This builds each message directly rather than interpreting a %-style format string for
+    every record.
+    """
 
-    def __init__(self, fmt: str):
+    def __init__(self, prefix: str, show_level: bool):
         super().__init__()
-        self.base_format = fmt
+        self.prefix = prefix
+        self.show_level = show_level
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        if self.show_level:
+            return f'{self.prefix}{record.levelno} {record.filename}: {record.message}'
+        return f'{self.prefix}{record.filename}: {record.message}'
+
+
+class SyslogFormatter(LogFormatter):
+    """Formats log messages with a syslog-style level prefix."""
 
-    def format(self, record: logging.LogRecord) -> str:  # noqa: A003
-        self._style._fmt = f'<{logging_level_to_syslog(record.levelno)}>' + self.base_format
-        return super().format(record)
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        return f'<{logging_level_to_syslog(record.levelno)}>' + super().formatMessage(record)
 
 
 def setup(args: argparse.Namespace, program: Optional[str] = None, subprogram: str = ''):
@@ -52,14 +70,16 @@ def setup(args: argparse.Namespace, program: Optional[str] = None, subprogram: s
         program = shlex.quote(calling_program())
     if subprogram:
         program = f'{program}|{subprogram}'
-    # Escape percents to pass through format()
-    program = program.replace('%', '%%')
     if args.debug:
-        logging.basicConfig(level=logging.DEBUG, format=program + ' %(levelno)s %(filename)s: %(message)s',)
+        level = logging.DEBUG
+        prefix = program + ' '
     elif args.verbose:
-        logging.basicConfig(level=logging.INFO, format=program + ' %(filename)s: %(message)s',)
+        level = logging.INFO
+        prefix = program + ' '
     else:
-        logging.basicConfig(level=logging.WARNING, format='%(filename)s: %(message)s',)
-    if args.level_prefix:
-        for handler in logging.getLogger().handlers:
-            handler.setFormatter(SyslogFormatter(handler.formatter._style._fmt))
+        level = logging.WARNING
+        prefix = ''
+    formatter_class = SyslogFormatter if args.level_prefix else LogFormatter
+    handler = logging.StreamHandler()
+    handler.setFormatter(formatter_class(prefix, show_level=args.debug))
+    logging.basicConfig(level=level, handlers=[handler])
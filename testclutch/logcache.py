@@ -3,18 +3,95 @@
 Transparently compresses and decompresses logs, if desired.
 """
 
+import concurrent.futures
 import io
+import mmap
 import os
 import shutil
 import stat
+import time
+from typing import BinaryIO, Iterable, Optional
 
 from testclutch import config
 
-import zstd
+import zstandard
 
 
 COMPRESS_EXT = '.zst'
 
+# Amount of data to decompress at once when skipping forward in a compressed file
+SKIP_SIZE = 0x10000
+
+# Number of seconds for which a file found to be missing from the cache is assumed to still be
+# missing, without checking again
+MISSING_CACHE_SECONDS = 5
+
+# Time at which each file was last found to be missing from the cache
+missing_cache = {}  # type: dict[str, float]
+
+# Shared by all callers of move_many_into_cache_compressed so that there is never more than one
+# compression thread per CPU, no matter how many threads are ingesting logs at once.
+# Threads are only started once needed.
+compress_executor = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count())
+
+
+class ZstdReader(io.RawIOBase):
+    """Seekable raw stream that decompresses a zstd file on the fly.
+
+    The compressed file is memory mapped so the decompressor reads it straight out of the page
+    cache instead of copying it through a file buffer first.
+
+    Seeking backward restarts decompression from the beginning of the file, so it is only
+    efficient when rewinding to the start, which is what the log parsers do.
+    """
+
+    def __init__(self, f: BinaryIO):
+        super().__init__()
+        with f:
+            self.mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # The decompressor only treats it as a buffer (rather than a file to read()) when
+        # given a memoryview
+        self.view = memoryview(self.mapped)
+        self._restart()
+
+    def _restart(self):
+        self.reader = zstandard.ZstdDecompressor().stream_reader(
+            self.view, read_across_frames=True)
+        self.pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = self.reader.readinto(b)
+        self.pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.pos
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation('Cannot seek relative to the end')
+        if offset < self.pos:
+            self._restart()
+        while self.pos < offset:
+            if not self.read(min(offset - self.pos, SKIP_SIZE)):
+                break
+        return self.pos
+
+    def close(self):
+        if not self.closed:
+            self.reader.close()
+            # The reader holds on to the buffer until it's freed, which must happen before the
+            # map can be closed
+            del self.reader
+            self.view.release()
+            self.mapped.close()
+        super().close()
+
 
 def create_dirs(subdir: str):
     """Create any parent directories that don't exist."""
@@ -26,6 +103,9 @@ def in_cache(fn: str) -> bool:
 
     The file may optionally be compressed.
     """
+    if (missing := missing_cache.get(fn)) is not None:
+        if time.monotonic() - missing < MISSING_CACHE_SECONDS:
+            return False
     path = os.path.join(config.expand('log_cache_path'), fn)
     try:
         os.stat(path)
@@ -34,51 +114,117 @@ def in_cache(fn: str) -> bool:
         try:
             os.stat(path)
         except FileNotFoundError:
+            missing_cache[fn] = time.monotonic()
             return False
     return True
 
 
+def cached_listing(subdir: str) -> set[str]:
+    """Return the names of all files in a cache directory."""
+    try:
+        with os.scandir(os.path.join(config.expand('log_cache_path'), subdir)) as it:
+            return {entry.name for entry in it}
+    except FileNotFoundError:
+        return set()
+
+
+def in_cache_many(fns: Iterable[str]) -> dict[str, bool]:
+    """Return whether each file exists in cache.
+
+    This is much faster than calling in_cache() on many files, since each directory is read
+    only once instead of checking each file separately.
+    """
+    listings = {}  # type: dict[str, set[str]]
+    found = {}
+    for fn in fns:
+        subdir, name = os.path.split(fn)
+        if (names := listings.get(subdir)) is None:
+            names = listings[subdir] = cached_listing(subdir)
+        found[fn] = name in names or name + COMPRESS_EXT in names
+    return found
+
+
 # TODO: figure out return type; -> IO gives errors on callers
 def open_cache_file(fn: str, mode: str = 'r'):
+    """Open a file in the cache for reading, decompressing it if necessary.
+
+    Raises FileNotFoundError if the file isn't in the cache, so there is no need to call
+    in_cache() first; that would just check for the file a second time.
+    """
     if mode.find('r') < 0:
         raise RuntimeError(f'Must be read mode: {mode}')
     path = os.path.join(config.expand('log_cache_path'), fn)
     try:
-        compress_path = path + COMPRESS_EXT
-        with open(compress_path, 'rb') as compress_file:
-            if mode.find('b') >= 0:
-                # Could add this using io.BytesIO if we need to
-                raise RuntimeError(f'Binary mode not supported: {mode}')
-            # If any bad characters are encountered while decoding using this charset (such as if a
-            # binary file was displayed in a log dump), they will automatically be replaced with
-            # backslash escapes.
-            return io.StringIO(zstd.decompress(compress_file.read()).decode(
-                config.expand('log_charset'), errors='backslashreplace'))
+        compress_file = open(path + COMPRESS_EXT, 'rb')
     except FileNotFoundError:
         return open(path, mode)
 
+    if mode.find('b') >= 0:
+        # Could add this by returning a BufferedReader if we need to
+        compress_file.close()
+        raise RuntimeError(f'Binary mode not supported: {mode}')
+    # The file is decompressed and decoded as it is read to avoid ever having to hold the entire
+    # log in memory.
+    # If any bad characters are encountered while decoding using this charset (such as if a
+    # binary file was displayed in a log dump), they will automatically be replaced with
+    # backslash escapes.
+    return io.TextIOWrapper(io.BufferedReader(ZstdReader(compress_file)),
+                            encoding=config.expand('log_charset'), errors='backslashreplace')
+
 
 def move_into_cache(from_file: str, to_file: str):
     """Move a file directly into the cache."""
     to_path = os.path.join(config.expand('log_cache_path'), to_file)
     shutil.move(from_file, to_path)
+    missing_cache.pop(to_file, None)
 
 
-def move_into_cache_compressed(from_file: str, to_file: str):
+def move_into_cache_compressed(from_file: str, to_file: str, threads: Optional[int] = None):
     """Compress a file and move it into the cache.
 
-    Don't compress it if it's too small.
+    Don't compress it if it's too small. threads is the number of zstd compression threads to
+    use, defaulting to the zstd_threads config value.
     """
-    if os.stat(from_file)[stat.ST_SIZE] <= config.get('compress_threshold_bytes'):
-        # There is a bug where zstd writes a warning message
-        # "PY_SSIZE_T_CLEAN will be required for '#' formats" into the file that corrupts it when
-        # given a zero-length file. This threshold eliminates that problem, as well as the overhead
-        # to compress and decompress an already-tiny file.
+    size = os.stat(from_file)[stat.ST_SIZE]
+    if size <= config.get('compress_threshold_bytes'):
+        # This threshold eliminates the overhead to compress and decompress an already-tiny file.
+        # It also avoided a bug in the zstd module used previously, which wrote a warning message
+        # "PY_SSIZE_T_CLEAN will be required for '#' formats" into a zero-length file,
+        # corrupting it.
         move_into_cache(from_file, to_file)
         return
 
-    compressed = zstd.compress(open(from_file, 'rb').read())
+    # Compress in a streaming fashion to avoid having to hold the entire file in memory
     to_path = os.path.join(config.expand('log_cache_path'), to_file + COMPRESS_EXT)
-    with open(to_path, 'wb') as out_file:
-        out_file.write(compressed)
+    with open(from_file, 'rb') as in_file, open(to_path, 'wb') as out_file:
+        # A compressor object mustn't be used by more than one thread at once, so make a new one
+        # each time so this can be called by move_many_into_cache_compressed.
+        if threads is None:
+            threads = config.get('zstd_threads')
+        compressor = zstandard.ZstdCompressor(level=config.get('zstd_level'), threads=threads)
+        compressor.copy_stream(in_file, out_file, size=size)
     os.unlink(from_file)
+    missing_cache.pop(to_file, None)
+
+
+def move_many_into_cache_compressed(files: Iterable[tuple[str, str]]):
+    """Compress many files and move them into the cache.
+
+    files is an iterable of (from_file, to_file) pairs, as passed to move_into_cache_compressed.
+    The compressor releases the GIL, so the files are compressed in parallel in threads.
+    Each file is compressed in a single thread, since there is already one per CPU, rather than
+    using zstd_threads threads each.
+    """
+    # list() is needed to wait for the compression and raise any exceptions that happened in the
+    # threads
+    list(compress_executor.map(lambda f: move_into_cache_compressed(*f, threads=0), files))
+
+
+def discard_many(files: Iterable[tuple[str, str]]):
+    """Delete files that will no longer be moved into the cache.
+
+    files is an iterable of (from_file, to_file) pairs, as passed to
+    move_many_into_cache_compressed.
+    """
+    for from_file, _ in files:
+        os.unlink(from_file)
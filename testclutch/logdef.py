@@ -8,7 +8,12 @@ from testclutch.testcasedef import TestResult
 
 @dataclass
 class SingleTestFinding:
-    """Class to hold the result of a single run of a single test."""
+    """Class to hold the result of a single run of a single test.
+
+    Logs can hold many thousands of these, so __slots__ avoids a per-instance __dict__.
+    """
+
+    __slots__ = ('name', 'result', 'reason', 'duration')
 
     name: str           # test name
     result: TestResult  # test result
@@ -7,21 +7,19 @@ If more than one test series is found in the log, they are concatenated and trea
 
 import logging
 import re
+import sys
 
 from testclutch.filedef import TextIOReadline
 from testclutch.logdef import ParsedLog, SingleTestFinding, TestCases, TestMeta  # noqa: F401
 from testclutch.testcasedef import TestResult
 
 
-# Pass/fail status for a test
-RESULT_RE = re.compile(r'^(PASS|FAIL|SKIP|XFAIL|XPASS|ERROR):\s(.+?)(( - )(.*))?$')
+# Pass/fail status for a test, or start of summary log at end
+RESULT_RE = re.compile(r'^(?:(?P<result>PASS|FAIL|SKIP|XFAIL|XPASS|ERROR):\s(?P<name>.+?)'
+                       r'(?: - (?P<info>.*))?|Testsuite summary for (?P<target>.*))$')
 
-# Start/end of summary log at end
-SUMMARY_START_RE = re.compile(r'^Testsuite summary for (.*)$')
-SUMMARY_END_RE = re.compile(r'^# ERROR:\s+(\d+)$')
-
-# Summary failure line
-SUMMARY_FAIL_RE = re.compile(r'^# FAIL:\s+(\d+)$')
+# Summary failure line, or end of summary log
+SUMMARY_RE = re.compile(r'^# (?:FAIL:\s+(?P<fail>\d+)|ERROR:\s+(?P<error>\d+))$')
 
 
 def result_code(result: str) -> TestResult:
@@ -44,40 +42,51 @@ def parse_log_file(f: TextIOReadline) -> ParsedLog:
     """Parses automake's test output."""
     meta = {}       # type: TestMeta
     testcases = []  # type: TestCases
-    while l := f.readline():
-        if r := RESULT_RE.search(l):
+    # The TextIOReadline protocol only guarantees readline, so the log can't be read all at
+    # once. Iterating with iter() still keeps the per-line looping in C, and sharing the
+    # iterator with the summary loop below lets it carry on where the other loop left off.
+    lines = iter(f.readline, '')
+    for l in lines:
+        if not (r := RESULT_RE.match(l)):
+            continue
+
+        if result := r.group('result'):
             # Found a test result
-            if m := r.group(5):
-                info = m.strip()
+            # Test names and reasons repeat a lot, both within a log and across the many logs
+            # ingested at once, so interning them saves a lot of memory.
+            if m := r.group('info'):
+                info = sys.intern(m.strip())
             else:
                 info = ''
-            if code := result_code(r.group(1)):
-                testcases.append(SingleTestFinding(r.group(2), code, info, 0))
+            name = sys.intern(r.group('name'))
+            if code := result_code(result):
+                testcases.append(SingleTestFinding(name, code, info, 0))
             else:
-                testcases.append(SingleTestFinding(r.group(2), TestResult.UNKNOWN, info, 0))
+                testcases.append(SingleTestFinding(name, TestResult.UNKNOWN, info, 0))
             if meta.get('testresult') == 'success':
                 # This is the second (or more) test suite result in the log file, so delete
                 # a previous success result so this one's result will prevail.
                 del meta['testresult']
 
-        elif r := SUMMARY_START_RE.search(l):
-            desc = r.group(1)
+        else:
+            desc = r.group('target')
             if desc.endswith(' -'):
                 desc = desc[:-2]
-            meta['testtarget'] = desc
+            meta['testtarget'] = sys.intern(desc)
 
             # Summary section
-            while l := f.readline():
-                if r := SUMMARY_FAIL_RE.search(l):
-                    if r.group(1) == '0':
+            for l in lines:
+                if r := SUMMARY_RE.match(l):
+                    if (fail := r.group('fail')) is None:
+                        # End of summary
+                        break
+                    if fail == '0':
                         # If more than one test log is found in the file, we don't want to
                         # replace a failure result with success.
                         if 'testresult' not in meta:
                             meta['testresult'] = 'success'
                     else:
                         meta['testresult'] = 'failure'
-                elif r := SUMMARY_END_RE.search(l):
-                    break
 
     if testcases:
         logging.debug('Found an automake test log')
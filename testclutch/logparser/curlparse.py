@@ -1,8 +1,10 @@
 """Parses curl test log files."""
 
+import contextlib
 import datetime
 import logging
 import re
+import sys
 import zlib
 
 from testclutch import uname
@@ -15,12 +17,15 @@ from testclutch.testcasedef import TestResult
 # NOTE: if lines are added below that match spaces at the start of a line,
 # update ingest/curlauto.py at the same time
 
+# Most of these regexes are used with match(), which anchors them at the start of the line
+# without needing a ^. Those used with search() may match anywhere in the line.
+
 # Early headers
 # TODO: this is obsolete after 2024-09-20 which added Args:
 RE_RUNTESTS = re.compile(r'perl.*/runtests\.pl (.*)$')
 # If a log is truncated, this line won't be found; use a different one (that may not be as reliable)
 # RE_USINGAUTOMAKE = re.compile(r'make +all-am')
-RE_USINGAUTOMAKE = re.compile(r'^Making all in ')
+RE_USINGAUTOMAKE = re.compile(r'Making all in ')
 # It's easier to figure out the compiler path on a libtool invocation, so restrict checking to that
 RE_COMPILERPATHAC = re.compile(r"""libtool .*--mode=compile (\S+) """)
 
@@ -28,30 +33,30 @@ RE_COMPILERPATHAC = re.compile(r"""libtool .*--mode=compile (\S+) """)
 # These won't be available in most logs because they show up before a compile,
 # not before a test run, so jobs where those are separated won't see them.
 RE_COMPILERAC = re.compile(r"compiler version\.\.\. ([^']+) '([^']*)'(?: \(raw: '([^']*)'\))?")
-RE_COMPILERCMAKE = re.compile(r'^-- The C compiler identification is (\S+) (\S+)')
-RE_USINGCMAKE = re.compile(r'^-- Using CMake version')
-RE_USINGCMAKEMSBUILD = re.compile(r'^(\d+>)?Checking Build System')
-RE_USINGCMAKEMAKE = re.compile(r'^\[ *\d+%] (Building C object|Built target)')
-RE_USINGCMAKENINJA = re.compile(r'^\[\d+/\d+\] (Building C object|Built target)')
+RE_COMPILERCMAKE = re.compile(r'-- The C compiler identification is (\S+) (\S+)')
+RE_USINGCMAKE = re.compile(r'-- Using CMake version')
+RE_USINGCMAKEMSBUILD = re.compile(r'(\d+>)?Checking Build System')
+RE_USINGCMAKEMAKE = re.compile(r'\[ *\d+%] (Building C object|Built target)')
+RE_USINGCMAKENINJA = re.compile(r'\[\d+/\d+\] (Building C object|Built target)')
 RE_USINGCMAKERUNMAKE = re.compile(r'make  *-f CMakeFiles')  # used if we missed the configure stage
 
 # Test log header
-RE_START = re.compile(r'^\*{9} System characteristics \*')
-RE_CURLVER = re.compile(r'^\* curl (\S+) \(([^)]+)\)')
-RE_DEPS = re.compile(r'^\* (.+)$')
-RE_HOST = re.compile(r'^\* Host: (\S+)')
-RE_FEATURES = re.compile(r'^\* Features: (.*)$')
-RE_PROTOCOLS = re.compile(r'^\* Protocols: (.*)$')
-RE_OS = re.compile(r'^\* OS: (\S+)')
-RE_PERL = re.compile(r'^\* Perl: v([\d.]+\d)')
-RE_JOBS = re.compile(r'^\* Jobs: (\d+)')
-RE_ARGS = re.compile(r'^\* Args: (.+)')
-RE_SYSTEM = re.compile(r'^\* System: (\S+ \S* \S+.*)$')
-RE_SEED = re.compile(r'^\* Seed: (\d+)')
+RE_START = re.compile(r'\*{9} System characteristics \*')
+RE_CURLVER = re.compile(r'\* curl (\S+) \(([^)]+)\)')
+RE_DEPS = re.compile(r'\* (.+)$')
+RE_HOST = re.compile(r'\* Host: (\S+)')
+RE_FEATURES = re.compile(r'\* Features: (.*)$')
+RE_PROTOCOLS = re.compile(r'\* Protocols: (.*)$')
+RE_OS = re.compile(r'\* OS: (\S+)')
+RE_PERL = re.compile(r'\* Perl: v([\d.]+\d)')
+RE_JOBS = re.compile(r'\* Jobs: (\d+)')
+RE_ARGS = re.compile(r'\* Args: (.+)')
+RE_SYSTEM = re.compile(r'\* System: (\S+ \S* \S+.*)$')
+RE_SEED = re.compile(r'\* Seed: (\d+)')
 # These could all match on the same line
-RE_VALGRIND = re.compile(r'^\* Env:.*\bValgrind\b')
-RE_EVENT = re.compile(r'^\* Env:.*\bevent-based\b')
-RE_DUPHANDLE = re.compile(r'^\* Env:.*\btest-duphandle\b')
+RE_VALGRIND = re.compile(r'\* Env:.*\bValgrind\b')
+RE_EVENT = re.compile(r'\* Env:.*\bevent-based\b')
+RE_DUPHANDLE = re.compile(r'\* Env:.*\btest-duphandle\b')
 
 # Buildinfo fields in header, starting 2024-09-06
 # Some are duplicated by other runtests.pl lines, namely:
@@ -70,63 +75,85 @@ RE_DUPHANDLE = re.compile(r'^\* Env:.*\btest-duphandle\b')
 # Note that these regexes expect no prefix (which on runtests.pl logs will be "* ") before being
 # matched.
 # TODO: after a suitable period, remove the duplicate data fields that come from compile logs.
-RE_BI_COMPILER = re.compile(r'^buildinfo\.compiler: (.+)$')
-RE_BI_COMPILERVER = re.compile(r'^buildinfo\.compiler\.version: (\S+)')
-RE_BI_GENERATOR = re.compile(r'^buildinfo\.configure\.generator: (.+)$')
-RE_BI_CONFIGURETOOL = re.compile(r'^buildinfo\.configure\.tool: (.+)$')
-RE_BI_CONFIGUREARGS = re.compile(r'^buildinfo\.configure\.args: (.+)$')
-RE_BI_CONFIGUREVER = re.compile(r'^buildinfo\.configure\.version: (\S+)')
-RE_BI_TARGETTRIPLET = re.compile(r'^buildinfo\.target: (\S+)$')
-RE_BI_TARGETCPU = re.compile(r'^buildinfo\.target\.cpu: (\S+)')
-RE_BI_TARGETOS = re.compile(r'^buildinfo\.target\.os: (.+)')
-RE_BI_HOSTTRIPLET = re.compile(r'^buildinfo\.host: (\S+)$')
-RE_BI_HOSTOS = re.compile(r'^buildinfo\.host\.os: (.+)$')
-RE_BI_HOSTCPU = re.compile(r'^buildinfo\.host\.cpu: (\S+)$')
+RE_BI_COMPILER = re.compile(r'buildinfo\.compiler: (.+)$')
+RE_BI_COMPILERVER = re.compile(r'buildinfo\.compiler\.version: (\S+)')
+RE_BI_GENERATOR = re.compile(r'buildinfo\.configure\.generator: (.+)$')
+RE_BI_CONFIGURETOOL = re.compile(r'buildinfo\.configure\.tool: (.+)$')
+RE_BI_CONFIGUREARGS = re.compile(r'buildinfo\.configure\.args: (.+)$')
+RE_BI_CONFIGUREVER = re.compile(r'buildinfo\.configure\.version: (\S+)')
+RE_BI_TARGETTRIPLET = re.compile(r'buildinfo\.target: (\S+)$')
+RE_BI_TARGETCPU = re.compile(r'buildinfo\.target\.cpu: (\S+)')
+RE_BI_TARGETOS = re.compile(r'buildinfo\.target\.os: (.+)')
+RE_BI_HOSTTRIPLET = re.compile(r'buildinfo\.host: (\S+)$')
+RE_BI_HOSTOS = re.compile(r'buildinfo\.host\.os: (.+)$')
+RE_BI_HOSTCPU = re.compile(r'buildinfo\.host\.cpu: (\S+)$')
+# CMake generators that produce makefiles
+MAKEFILE_GENERATORS = frozenset(('Unix Makefiles', 'MSYS Makefiles'))
+# Endings of the configure tool path when CMake is used
+CMAKE_SUFFIXES = ('cmake', 'cmake.exe')
 
 # Test log results
-RE_STARTRESULTS = re.compile(r'^\*{41}')
-RE_TOIGNORE = re.compile(r'^Warning: test(\d{1,5}) result is ignored')
-RE_SKIPPED = re.compile(r'^test (\d{4,5}) SKIPPED: (.*)$')
-RE_FAILED = re.compile(r'^ (\d{1,5}): ((\w+)( \(.*\))?) FAILED')
-RE_VALGRINDFAILED = re.compile(r'^ (valgrind) ERROR')
-RE_IGNORED = re.compile(r'^ (\d{1,5}): IGNORED: (.*)$')
-# Obsolete after 2023-06-21
-RE_EXITFAILED = re.compile(r'^ (exit) FAILED$')
-RE_TESTSTART = re.compile(r'^test (\d{4,5})\.\.\.\[')
-RE_SKIPAFTERSTART = re.compile(r'(^(CMD |RUN: |Warning: |postcheck |curl returned |Killed|'
-                               r' (\d+) functions to make fail)|'
-                               r'functions found, but only fail|received SIGINT, exiting)|'
-                               r'(^\s?$)|( log/(\d+/)?std)|(^\S+ returned .* expecting (\d)+$)')
-RE_ABORTED = re.compile(r'Aborting tests$')
-# Should be just {11} after 2023-06-21
-RE_TESTRESULTOK = re.compile(r'^.{10,11} OK \(.*, took (-?\d+\.\d+)s')
-RE_TORTUREOK = re.compile(r'^torture OK$')
-RE_TORTUREFAILED = re.compile(r'MEMORY FAILURE$')
-RE_TORTURESKIPPED = re.compile(r'^ found (no functions to make fail)$')
+RE_STARTRESULTS = re.compile(r'\*{41}')
+# The lines in the results section that are anchored at the start, combined into a single regex
+# so a line needs only one match() to find which kind it is. The alternatives are in the order
+# they must be checked. The name of the outer group of each alternative (available in lastgroup)
+# shows which one matched.
+RE_RESULTLINE = re.compile(
+    r'(?P<skipped>test (?P<skippedno>\d{4,5}) SKIPPED: (?P<skippedreason>.*)$)'
+    r'|(?P<teststart>test (?P<teststartno>\d{4,5})\.\.\.\[)'
+    # With -s option
+    r'|(?P<teststartshort>test \d{4,5}\.\.\.$)'
+    r'|(?P<failed> (?P<failedno>\d{1,5}): (?P<failedreason>\w+(?: \(.*\))?) FAILED)'
+    r'|(?P<ignored> (?P<ignoredno>\d{1,5}): IGNORED: (?P<ignoredreason>.*)$)'
+    # With -s option
+    r'|(?P<testresultshort>test (?P<testresultshortno>\d{4,5})\.\.\.(?P<testresultshortstatus>\w+)'
+    r' \(.*, took (?P<testresultshorttime>-?\d+\.\d+)s)'
+    # With -s option
+    r'|(?P<testfailedshort>test (?P<testfailedshortno>\d{4,5})\.\.\.FAILED$)'
+    r'|(?P<oksummary>TESTDONE: \d+ tests out of \d+ reported OK)'
+    r'|(?P<failsummary>TESTFAIL: These test cases failed: )'
+    r'|(?P<toignore>Warning: test(?P<toignoreno>\d{1,5}) result is ignored)'
+    r'|(?P<enddate>testcurl: enddate = (?P<enddatedate>.*)$)')
 RE_TOTALTIME = re.compile(r'tests were considered during (\d+) seconds')
-RE_OKSUMMARY = re.compile(r'^TESTDONE: (\d+) tests out of (\d+) reported OK')
-RE_FAILSUMMARY = re.compile(r'^TESTFAIL: These test cases failed: ')
+# Suffix of a line that ends testing early
+ABORTED = 'Aborting tests'
 
-# Test log results with -s option
-RE_TESTSTARTSHORT = re.compile(r'^test (\d{4,5})\.\.\.$')
-RE_TESTRESULTSHORT = re.compile(r'^test (\d{4,5})\.\.\.(\w+) \(.*, took (-?\d+\.\d+)s')
-RE_TESTFAILEDSHORT = re.compile(r'^test (\d{4,5})\.\.\.FAILED$')
+# Test status lines after the start of a test
+RE_FAILED = re.compile(r' (\d{1,5}): ((\w+)( \(.*\))?) FAILED')
+RE_VALGRINDFAILED = re.compile(r' (valgrind) ERROR')
+RE_IGNORED = re.compile(r' (\d{1,5}): IGNORED: (.*)$')
+# Obsolete after 2023-06-21
+RE_EXITFAILED = re.compile(r' (exit) FAILED$')
+# Lines to skip after the start of a test: these prefixes, these substrings, an empty line, or
+# anything matching these regexes (see skip_after_start())
+SKIPAFTERSTART_PREFIXES = ('CMD ', 'RUN: ', 'Warning: ', 'postcheck ', 'curl returned ', 'Killed')
+SKIPAFTERSTART_SUBSTRINGS = ('functions found, but only fail', 'received SIGINT, exiting')
+RE_SKIPAFTERSTART = re.compile(r' \d+ functions to make fail|\S+ returned .* expecting \d+$')
+RE_SKIPAFTERSTARTLOG = re.compile(r' log/(\d+/)?std')
+# Should be just {11} after 2023-06-21
+RE_TESTRESULTOK = re.compile(r'.{10,11} OK \(.*, took (-?\d+\.\d+)s')
+RE_TORTUREOK = re.compile(r'torture OK$')
+TORTUREFAILED = 'MEMORY FAILURE'
+RE_TORTURESKIPPED = re.compile(r' found (no functions to make fail)$')
 
 # testcurl headers
-RE_TESTCURLCOMMITSTART = re.compile(r'^testcurl: The most recent curl git commits:')
-RE_TESTCURLCOMMIT = re.compile(r'^testcurl:( ){1,3}'
+RE_TESTCURLCOMMITSTART = re.compile(r'testcurl: The most recent curl git commits:')
+RE_TESTCURLCOMMIT = re.compile(r'testcurl:( ){1,3}'
                                r'(((?P<shash>[0-9a-f]{7,11})(?: ))|(?P<lhash>[0-9a-f]{40}$))')
-RE_TESTCURLDAILY = re.compile(r'^testcurl: curl-([\d.]+)-(\d{8})/? is verified to be '
+RE_TESTCURLDAILY = re.compile(r'testcurl: curl-([\d.]+)-(\d{8})/? is verified to be '
                               r'a fine daily source dir')
-RE_TESTCURLDATE = re.compile(r'^testcurl: date = (.*)$')
-RE_TESTCURLENDDATE = re.compile(r'^testcurl: enddate = (.*)$')
-RE_TESTCURLVER = re.compile(r'^testcurl: version = (.*)$')
+RE_TESTCURLDATE = re.compile(r'testcurl: date = (.*)$')
+RE_TESTCURLVER = re.compile(r'testcurl: version = (.*)$')
 RE_TESTCURLNAME = re.compile(r'testcurl: NAME = (.*)$')
 RE_TESTCURLDESC = re.compile(r'testcurl: DESC = (.*)$')
 RE_TESTCURLBUILDCODE = re.compile(r'testcurl: (\w+) = ')
 TESTCURLBUILDCODEIGNORED = frozenset(('NOTES', 'version', 'date', 'timestamp'))
 # TODO: lots more testcurl headers that could be added here
 
+# Month abbreviations in testcurl dates
+MONTHS = {name: num for num, name in enumerate(
+    ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'), start=1)}
+
 # autoconf target (or host) triplet (sometimes quadruplet)
 RE_TARGETTRIPLET = re.compile(r'([\w.]+)-([\w.]+)-([-\w.]+)')
 
@@ -139,28 +166,43 @@ def escs(s: str) -> str:
     return s.encode('utf-8').decode('us-ascii', errors='backslashreplace')
 
 
-def strip0(n: str) -> str:
-    """Strip leading zeros in a string integer."""
-    return str(int(n))
+def testcurl_timestamp(date: str) -> int:
+    """Convert a testcurl date like "Sat Jul 29 17:45:51 2023 UTC" into a UNIX timestamp.
 
+    The fields are picked out by hand, which is much faster than strptime and doesn't depend on
+    the locale. strptime is used as a fallback for anything in an unexpected form.
+    """
+    parts = date.split()
+    if len(parts) == 6 and parts[5] == 'UTC' and (month := MONTHS.get(parts[1])):
+        with contextlib.suppress(ValueError):
+            hour, minute, second = parts[3].split(':')
+            timestamp = datetime.datetime(int(parts[4]), month, int(parts[2]), int(hour),
+                                          int(minute), int(second), tzinfo=datetime.timezone.utc)
+            return int(timestamp.timestamp())
+    # Replace "UTC" with the numeric time zone, which strptime can deal with
+    datestr = date.replace(' UTC', '+0000')
+    return int(datetime.datetime.strptime(datestr, '%a %b %d %H:%M:%S %Y%z').timestamp())
+
+
+def skip_after_start(l: str) -> bool:
+    """Return True if this stripped line after a test start is not the test status line.
+
+    Most lines are checked with quick string operations, leaving only a few for the regexes.
+    """
+    return (not l
+            or l.startswith(SKIPAFTERSTART_PREFIXES)
+            or any(sub in l for sub in SKIPAFTERSTART_SUBSTRINGS)
+            or bool(RE_SKIPAFTERSTART.match(l))
+            or (' log/' in l and bool(RE_SKIPAFTERSTARTLOG.search(l))))
 
-def check_found_result(testcases: TestCases):
-    """Check if a missing test result was found.
 
-    It can happen that an expected test result line is not found, usually due to an unexpected
-    line appearing instead (like a verbose log output line, or postcheck failure or similar.
-    In such a case, a TestResult.UNKNOWN result will be entered. However, subsequent parsing
-    can find the actual test result and that will be added to the list. That makes two results
-    for the same test which is not desired.
+def strip0(n: str) -> str:
+    """Strip leading zeros in a string integer.
 
-    This function looks at the last two test entries and deletes an UNKNOWN entry if the next
-    one contains the correct result.
+    This avoids converting to int and back. The result is used as a test name, and those repeat
+    a lot across the many logs ingested at once, so it is interned to save memory.
     """
-    if len(testcases) < 2:
-        return
-    if testcases[-1].name == testcases[-2].name and testcases[-2].result == TestResult.UNKNOWN:
-        del testcases[-2]
-    return
+    return sys.intern(n.lstrip('0') or '0')
 
 
 def parse_buildinfo(l: str) -> TestMetaStr:
@@ -169,8 +211,12 @@ def parse_buildinfo(l: str) -> TestMetaStr:
     The input strings are expected to start with "buildinfo..." without another prefix.
     """
     meta = {}
-    if r := RE_BI_GENERATOR.search(l):
-        if r.group(1) in {'Unix Makefiles', 'MSYS Makefiles'}:
+    # Callers pass in every otherwise unrecognized header line, and nearly all of them will not
+    # be buildinfo lines, so those skip the regexes entirely
+    if not l.startswith('buildinfo.'):
+        return meta
+    if r := RE_BI_GENERATOR.match(l):
+        if r.group(1) in MAKEFILE_GENERATORS:
             meta['buildsystem'] = 'cmake/make'
         elif r.group(1) == 'Ninja':
             meta['buildsystem'] = 'cmake/ninja'
@@ -178,21 +224,21 @@ def parse_buildinfo(l: str) -> TestMetaStr:
             meta['buildsystem'] = 'cmake/msbuild'
         else:
             logging.warning('Unknown cmake generator %s', r.group(1))
-    elif r := RE_BI_CONFIGURETOOL.search(l):
+    elif r := RE_BI_CONFIGURETOOL.match(l):
         if r.group(1) == 'configure':
             meta['buildsystem'] = 'automake'
-        elif r.group(1).endswith('cmake') or r.group(1).endswith('cmake.exe'):
+        elif r.group(1).endswith(CMAKE_SUFFIXES):
             # This should be made more specific momentarily on the generator line
             meta['buildsystem'] = 'cmake'
         else:
             logging.warning('Unknown configure program %s', r.group(1))
-    elif r := RE_BI_CONFIGUREARGS.search(l):
+    elif r := RE_BI_CONFIGUREARGS.match(l):
         meta['configureargs'] = r.group(1).strip()
-    elif r := RE_BI_CONFIGUREVER.search(l):
+    elif r := RE_BI_CONFIGUREVER.match(l):
         meta['buildsystemver'] = r.group(1)
-    elif r := RE_BI_COMPILER.search(l):
+    elif r := RE_BI_COMPILER.match(l):
         meta['compiler'] = r.group(1)
-    elif r := RE_BI_COMPILERVER.search(l):
+    elif r := RE_BI_COMPILERVER.match(l):
         # During a short transition period in 2024-09, this field could hold a
         # compilerversion or a compilerversioncode. Determine which it is by
         # looking at its contents. Once backward compatibility is no longer needed,
@@ -203,7 +249,7 @@ def parse_buildinfo(l: str) -> TestMetaStr:
             meta['compilerversion'] = ver
         else:
             meta['compilerversioncode'] = ver
-    elif r := RE_BI_TARGETTRIPLET.search(l):
+    elif r := RE_BI_TARGETTRIPLET.match(l):
         meta['targettriplet'] = r.group(1)
         if rr := RE_TARGETTRIPLET.search(r.group(1)):
             meta['targetarch'] = rr.group(1)
@@ -216,11 +262,11 @@ def parse_buildinfo(l: str) -> TestMetaStr:
         else:
             # Probably created by CMake, which doesn't use a triplet but just the OS
             meta['targetos'] = r.group(1)
-    elif r := RE_BI_TARGETCPU.search(l):
+    elif r := RE_BI_TARGETCPU.match(l):
         meta['targetarch'] = r.group(1)
-    elif r := RE_BI_TARGETOS.search(l):
+    elif r := RE_BI_TARGETOS.match(l):
         meta['targetos'] = r.group(1)
-    elif r := RE_BI_HOSTTRIPLET.search(l):
+    elif r := RE_BI_HOSTTRIPLET.match(l):
         meta['hosttriplet'] = r.group(1)
         if rr := RE_TARGETTRIPLET.search(r.group(1)):
             meta['hostarch'] = rr.group(1)
@@ -233,9 +279,9 @@ def parse_buildinfo(l: str) -> TestMetaStr:
         else:
             # Probably created by CMake, which doesn't use a triplet but just the OS
             meta['hostos'] = r.group(1)
-    elif r := RE_BI_HOSTCPU.search(l):
+    elif r := RE_BI_HOSTCPU.match(l):
         meta['hostarch'] = r.group(1)
-    elif r := RE_BI_HOSTOS.search(l):
+    elif r := RE_BI_HOSTOS.match(l):
         meta['hostos'] = r.group(1)
 
     return meta
@@ -250,12 +296,21 @@ def parse_log_file(f: TextIOReadline) -> ParsedLog:  # noqa: C901
     meta = {}         # type: TestMeta
     testcases = []    # type: TestCases
     toignore = set()  # type: set[str]
+    buildcode_lines = bytearray()  # testcurl lines making up the buildcode
     got_first = False
-    while l := f.readline():
+    # The TextIOReadline protocol only guarantees readline. Iterating with iter() keeps the
+    # per-line looping in C, and the nested loops below share the iterator so each carries on
+    # where the last one left off.
+    lines = iter(f.readline, '')
+    # Bound method used for every line, to avoid looking it up each time
+    match_resultline = RE_RESULTLINE.match
+    for l in lines:
         if not got_first:
             logging.debug('First log line: %s', escs(l))
             got_first = True
-        if RE_START.search(l):
+        # Most lines match none of the regexes below, so cheap substring checks are done first
+        # to avoid running most of them
+        if l.startswith('*********') and RE_START.match(l):
             logging.debug('Found the start of a curl test log')
             meta['testformat'] = 'curl'
             meta['testresult'] = 'truncated'  # will be overwritten if the real end is found
@@ -264,10 +319,10 @@ def parse_log_file(f: TextIOReadline) -> ParsedLog:  # noqa: C901
             meta['withevent'] = 'no'          # will be overwritten if event-based is enabled
             meta['withvalgrind'] = 'no'       # will be overwritten if Valgrind is enabled
             # ********* System characteristics ********
-            if not (l := f.readline()):
+            if not (l := next(lines, '')):
                 break
             l = l.rstrip()
-            if r := RE_CURLVER.search(l):
+            if r := RE_CURLVER.match(l):
                 meta['testingver'] = r.group(1)
                 meta['targettriplet'] = r.group(2)
                 if rr := RE_TARGETTRIPLET.search(r.group(2)):
@@ -282,235 +337,254 @@ def parse_log_file(f: TextIOReadline) -> ParsedLog:  # noqa: C901
                 elif r.group(2):
                     # Probably created by CMake, which doesn't use a triplet but just the OS
                     meta['targetos'] = r.group(2)
-            if not (l := f.readline()):
+            if not (l := next(lines, '')):
                 break
             l = l.rstrip()
-            if r := RE_DEPS.search(l):
+            if r := RE_DEPS.match(l):
                 meta['curldeps'] = r.group(1)
-                while l := f.readline():
+                for l in lines:
                     l = l.rstrip()
-                    # These checks could all match the same line
-                    if r := RE_VALGRIND.search(l):
-                        meta['withvalgrind'] = 'yes'
-                    if r := RE_EVENT.search(l):
-                        meta['withevent'] = 'yes'
-                    if r := RE_DUPHANDLE.search(l):
-                        meta['withduphandle'] = 'yes'
+                    # These checks could all match the same line, which is only ever the
+                    # single Env: line, so the other header lines skip them entirely
+                    if l.startswith('* Env:'):
+                        if r := RE_VALGRIND.match(l):
+                            meta['withvalgrind'] = 'yes'
+                        if r := RE_EVENT.match(l):
+                            meta['withevent'] = 'yes'
+                        if r := RE_DUPHANDLE.match(l):
+                            meta['withduphandle'] = 'yes'
                     # These checks are all mutually exclusive
-                    if r := RE_HOST.search(l):
+                    if r := RE_HOST.match(l):
                         meta['host'] = r.group(1)
-                    elif r := RE_FEATURES.search(l):
+                    elif r := RE_FEATURES.match(l):
                         meta['features'] = r.group(1)
-                    elif r := RE_PROTOCOLS.search(l):
+                    elif r := RE_PROTOCOLS.match(l):
                         meta['curlprotocols'] = r.group(1)
-                    elif r := RE_ARGS.search(l):
+                    elif r := RE_ARGS.match(l):
                         meta['runtestsopts'] = r.group(1)
-                    elif r := RE_OS.search(l):
+                    elif r := RE_OS.match(l):
                         meta['os'] = r.group(1)
-                    elif r := RE_PERL.search(l):
+                    elif r := RE_PERL.match(l):
                         meta['perlver'] = r.group(1)
-                    elif r := RE_JOBS.search(l):
+                    elif r := RE_JOBS.match(l):
                         meta['paralleljobs'] = r.group(1)
-                    elif r := RE_SEED.search(l):
+                    elif r := RE_SEED.match(l):
                         meta['randomseed'] = r.group(1)
-                    elif r := RE_SYSTEM.search(l):
+                    elif r := RE_SYSTEM.match(l):
                         unamemeta = uname.parse_uname(r.group(1))
                         if unamemeta:
-                            meta = {**meta, **unamemeta}
+                            meta.update(unamemeta)
                         else:
                             logging.warning('Unexpected uname line: %s', escs(r.group(1)))
                     elif l.startswith('* ') and (bimeta := parse_buildinfo(l[2:])):
-                        meta = {**meta, **bimeta}
-                    elif RE_STARTRESULTS.search(l):
+                        meta.update(bimeta)
+                    elif RE_STARTRESULTS.match(l):
                         # *****************************************
-                        while l := f.readline():
+                        for l in lines:
                             l = l.rstrip()
-                            if r := RE_SKIPPED.search(l):
-                                testcases.append(SingleTestFinding(strip0(r.group(1)), TestResult.SKIP,
-                                                                   r.group(2), 0))
-                            elif r := RE_TESTSTART.search(l):
+                            # Only the two floating regexes aren't part of RE_RESULTLINE
+                            r = match_resultline(l)
+                            kind = r.lastgroup if r else None
+                            if kind == 'skipped':
+                                testcases.append(SingleTestFinding(
+                                    strip0(r.group('skippedno')), TestResult.SKIP,
+                                    sys.intern(r.group('skippedreason')), 0))
+                            elif kind == 'teststart':
                                 # In case verbose mode is on, skip the verbose lines
                                 # (this doesn't always work properly)
                                 # Also skip other test harness warning messages
                                 # TODO: maybe just rely on RE_TESTRESULTOK matching properly
                                 # and don't bother doing it this way. This way is less likely
                                 # to correlate the wrong result with a test, though.
-                                while l := f.readline():
-                                    if not RE_SKIPAFTERSTART.search(l.rstrip()):
+                                for l in lines:
+                                    l = l.rstrip()
+                                    if not skip_after_start(l):
                                         break
-                                if not l:
+                                else:
                                     # EOF
                                     break
-                                l = l.rstrip()
-                                if rr := RE_TESTRESULTOK.search(l):
+                                if rr := RE_TESTRESULTOK.match(l):
                                     duration = int(float(rr.group(1)) * 1000000)
                                     if duration < 0:
                                         duration = 0  # bug in the test harness
-                                    testno = strip0(r.group(1))
+                                    testno = strip0(r.group('teststartno'))
                                     testcases.append(SingleTestFinding(
                                         testno, TestResult.PASS, '', duration))
-                                elif rr := RE_TORTUREOK.search(l):
-                                    testno = strip0(r.group(1))
+                                elif rr := RE_TORTUREOK.match(l):
+                                    testno = strip0(r.group('teststartno'))
                                     testcases.append(SingleTestFinding(
                                         testno, TestResult.PASS, '', 0))
                                     meta['testmode'] = 'torture'
-                                elif rr := RE_FAILED.search(l):
+                                elif rr := RE_FAILED.match(l):
                                     if rr.group(1) in toignore:
                                         result = TestResult.FAILIGNORE
                                     else:
                                         result = TestResult.FAIL
                                     testcases.append(SingleTestFinding(
-                                        rr.group(1), result, rr.group(2), 0))
-                                elif rr := RE_IGNORED.search(l):
+                                        sys.intern(rr.group(1)), result, rr.group(2), 0))
+                                elif rr := RE_IGNORED.match(l):
                                     testcases.append(SingleTestFinding(
-                                        rr.group(1), TestResult.SKIP, rr.group(2), 0))
-                                elif rr := RE_EXITFAILED.search(l):
-                                    testno = strip0(r.group(1))
+                                        sys.intern(rr.group(1)), TestResult.SKIP,
+                                        sys.intern(rr.group(2)), 0))
+                                elif rr := RE_EXITFAILED.match(l):
+                                    testno = strip0(r.group('teststartno'))
                                     if testno in toignore:
                                         result = TestResult.FAILIGNORE
                                     else:
                                         result = TestResult.FAIL
                                     testcases.append(SingleTestFinding(
                                         testno, result, rr.group(1), 0))
-                                elif rr := RE_ABORTED.search(l):
-                                    testno = strip0(r.group(1))
+                                elif l.endswith(ABORTED):
+                                    testno = strip0(r.group('teststartno'))
                                     testcases.append(SingleTestFinding(
-                                        testno, TestResult.ABORT, rr.group(0), 0))
-                                elif rr := RE_TORTUREFAILED.search(l):
+                                        testno, TestResult.ABORT, ABORTED, 0))
+                                elif l.endswith(TORTUREFAILED):
                                     # The real error line is coming up...just ignore this and wait
                                     meta['testmode'] = 'torture'
-                                elif rr := RE_VALGRINDFAILED.search(l):
-                                    testno = strip0(r.group(1))
+                                elif rr := RE_VALGRINDFAILED.match(l):
+                                    testno = strip0(r.group('teststartno'))
                                     if testno in toignore:
                                         result = TestResult.FAILIGNORE
                                     else:
                                         result = TestResult.FAIL
                                     testcases.append(SingleTestFinding(
                                         testno, result, rr.group(1), 0))
-                                elif rr := RE_TORTURESKIPPED.search(l):
-                                    testno = strip0(r.group(1))
+                                elif rr := RE_TORTURESKIPPED.match(l):
+                                    testno = strip0(r.group('teststartno'))
                                     testcases.append(SingleTestFinding(
-                                        testno, TestResult.SKIP, r.group(1), 0))
+                                        testno, TestResult.SKIP, r.group('teststartno'), 0))
                                     meta['testmode'] = 'torture'
                                 else:
                                     logging.warning('Expecting test status line, got: %s', escs(l))
-                                    testno = strip0(r.group(1))
+                                    testno = strip0(r.group('teststartno'))
                                     testcases.append(SingleTestFinding(
                                         testno, TestResult.UNKNOWN, 'no test status line', 0))
-                            elif r := RE_TESTSTARTSHORT.search(l):
+                            elif kind == 'teststartshort':
                                 # The next line will be a RE_FAILED, so just drop through and
                                 # it will be handled on the next pass below
                                 pass
-                            elif r := RE_FAILED.search(l):
-                                if r.group(1) in toignore:
+                            elif kind == 'failed':
+                                if r.group('failedno') in toignore:
                                     result = TestResult.FAILIGNORE
                                 else:
                                     result = TestResult.FAIL
                                 testcases.append(SingleTestFinding(
-                                    r.group(1), result, r.group(2), 0))
-                            elif r := RE_IGNORED.search(l):
+                                    sys.intern(r.group('failedno')), result,
+                                    r.group('failedreason'), 0))
+                            elif kind == 'ignored':
                                 testcases.append(SingleTestFinding(
-                                    r.group(1), TestResult.SKIP, r.group(2), 0))
-                            elif r := RE_ABORTED.search(l):
-                                # We have no RE_TESTSTART here to attach this to a specific test
+                                    sys.intern(r.group('ignoredno')), TestResult.SKIP,
+                                    sys.intern(r.group('ignoredreason')), 0))
+                            elif l.endswith(ABORTED):
+                                # We have no test start line here to attach this to a specific test
                                 # number, so we can't do anything but ignore it
                                 pass
-                            elif r := RE_TESTRESULTSHORT.search(l):
-                                assert r.group(2) == 'OK'  # I think this is true
-                                duration = int(float(r.group(3)) * 1000000)
+                            elif kind == 'testresultshort':
+                                # I think this is always true
+                                assert r.group('testresultshortstatus') == 'OK'
+                                duration = int(float(r.group('testresultshorttime')) * 1000000)
                                 if duration < 0:
                                     duration = 0  # bug in the test harness
-                                testno = str(int(r.group(1)))
+                                testno = strip0(r.group('testresultshortno'))
                                 testcases.append(SingleTestFinding(
                                     testno, TestResult.PASS, '', duration))
-                            elif r := RE_TESTFAILEDSHORT.search(l):
-                                if r.group(1) in toignore:
+                            elif kind == 'testfailedshort':
+                                if r.group('testfailedshortno') in toignore:
                                     result = TestResult.FAILIGNORE
                                 else:
                                     result = TestResult.FAIL
-                                testno = str(int(r.group(1)))
+                                testno = strip0(r.group('testfailedshortno'))
                                 testcases.append(SingleTestFinding(testno, result, '', 0))
-                            elif r := RE_TOTALTIME.search(l):
-                                meta['runtestsduration'] = str(int(r.group(1)) * 1000000)
-                            elif r := RE_OKSUMMARY.search(l):
+                            elif ('tests were considered' in l
+                                  and (rr := RE_TOTALTIME.search(l))):
+                                meta['runtestsduration'] = str(int(rr.group(1)) * 1000000)
+                            elif kind == 'oksummary':
                                 # This may be overwritten by the following failure line. Tests
                                 # can be considered to be successful even with a failing test,
                                 # since a test result can be marked as ignored.
                                 meta['testresult'] = 'success'
-                            elif r := RE_FAILSUMMARY.search(l):
+                            elif kind == 'failsummary':
                                 # This one will appear as well as the previous line, but this line
                                 # will prevail
                                 meta['testresult'] = 'failure'
-                            elif r := RE_TOIGNORE.search(l):
-                                toignore.add(r.group(1))
-                            elif r := RE_TESTCURLENDDATE.search(l):
-                                # Replace "UTC" with the numeric time zone, which strptime can
-                                # deal with
-                                datestr = r.group(1).replace(' UTC', '+0000')
-                                timestamp = datetime.datetime.strptime(datestr,
-                                                                       '%a %b %d %H:%M:%S %Y%z')
-                                meta['runfinishtime'] = int(timestamp.timestamp())
-                            check_found_result(testcases)
-
-        elif RE_TESTCURLCOMMITSTART.search(l):
+                            elif kind == 'toignore':
+                                toignore.add(r.group('toignoreno'))
+                            elif kind == 'enddate':
+                                meta['runfinishtime'] = testcurl_timestamp(r.group('enddatedate'))
+                            # It can happen that an expected test result line is not found,
+                            # usually due to an unexpected line appearing instead (like a
+                            # verbose log output line, or postcheck failure or similar). In such
+                            # a case, a TestResult.UNKNOWN result will have been entered above.
+                            # However, subsequent parsing can find the actual test result and
+                            # add it too, making two results for the same test. If that just
+                            # happened, delete the UNKNOWN one. This is checked for every line,
+                            # so it is done inline, cheapest test first.
+                            if (len(testcases) > 1
+                                    and testcases[-2].result == TestResult.UNKNOWN
+                                    and testcases[-1].name == testcases[-2].name):
+                                del testcases[-2]
+
+        elif (testcurl := 'testcurl: ' in l) and RE_TESTCURLCOMMITSTART.match(l):
             meta['executor'] = 'testcurl'
-            if not (l := f.readline()):
+            if not (l := next(lines, '')):
                 break
             # TODO: it appears that this first displayed commit isn't necessarily the one
             # being used, since some logs show this being from a bagder/* branch instead.
             # Not sure what causes this, unless it's a weird way that the daily build has
             # been set up. It is likely related to buildbot being set up to send PR build
             # results to the daily build server, not just pushes to master.
-            if r := RE_TESTCURLCOMMIT.search(l):
+            if r := RE_TESTCURLCOMMIT.match(l):
                 meta['commit'] = r.group('shash') if r.group('shash') else r.group('lhash')
-        elif r := RE_TESTCURLDAILY .search(l):
+        elif testcurl and (r := RE_TESTCURLDAILY.match(l)):
             meta['executor'] = 'testcurl'
             meta['dailybuild'] = r.group(2)
-        elif r := RE_TESTCURLNAME.search(l):
+        elif testcurl and (r := RE_TESTCURLNAME.match(l)):
             meta['ciname'] = r.group(1)
-        elif r := RE_TESTCURLDESC.search(l):
+        elif testcurl and (r := RE_TESTCURLDESC.match(l)):
             meta['cijob'] = r.group(1)
-        elif r := RE_TESTCURLDATE.search(l):
-            # Replace "UTC" with the numeric time zone, which strptime can deal with
-            datestr = r.group(1).replace(' UTC', '+0000')
-            timestamp = datetime.datetime.strptime(datestr, '%a %b %d %H:%M:%S %Y%z')
-            meta['runstarttime'] = int(timestamp.timestamp())
-        elif r := RE_TESTCURLVER.search(l):
+        elif testcurl and (r := RE_TESTCURLDATE.match(l)):
+            meta['runstarttime'] = testcurl_timestamp(r.group(1))
+        elif testcurl and (r := RE_TESTCURLVER.match(l)):
             meta['executorver'] = r.group(1)
-        elif r := RE_TESTCURLBUILDCODE.search(l):
+        elif testcurl and (r := RE_TESTCURLBUILDCODE.match(l)):
             # buildcode is a hash of testcurl lines that make up a unique code for the
             # source of this log. It is identical to the buildcode used internally on the
             # page https://curl.se/dev/builds.html
+            # The lines are all hashed at once at the end; a CRC of the concatenated lines is
+            # the same as the CRC of each one in turn.
             if r.group(1) not in TESTCURLBUILDCODEIGNORED:
-                current_code = meta.get('buildcode', 0)
                 # Use ISO 8859/1 to avoid any kind of encoding error; it hashes just as well
                 # as anything else
-                meta['buildcode'] = zlib.crc32(l.strip().encode('ISO-8859-1'), current_code)
-        elif r := RE_RUNTESTS.search(l):
+                buildcode_lines += l.strip().encode('ISO-8859-1')
+        elif 'runtests.pl ' in l and (r := RE_RUNTESTS.search(l)):
             # This may be overwritten later by RE_ARGS
             meta['runtestsopts'] = r.group(1)
-        elif r := RE_COMPILERAC.search(l):
+        elif 'compiler version...' in l and (r := RE_COMPILERAC.search(l)):
             meta['compiler'] = r.group(1)
             meta['compilerversioncode'] = r.group(2)
             if r.group(3):
                 meta['compilerversion'] = r.group(3)
-        elif r := RE_COMPILERCMAKE.search(l):
+        elif l.startswith('-- The C compiler') and (r := RE_COMPILERCMAKE.match(l)):
             meta['compiler'] = r.group(1)
             meta['compilerversion'] = r.group(2)
-        elif r := RE_USINGCMAKE.search(l):
+        elif l.startswith('-- Using CMake') and (r := RE_USINGCMAKE.match(l)):
             # This could be overwritten by a more specific version below
             meta['buildsystem'] = 'cmake'
-        elif r := RE_USINGCMAKEMSBUILD.search(l):
+        elif 'Checking Build System' in l and (r := RE_USINGCMAKEMSBUILD.match(l)):
             meta['buildsystem'] = 'cmake/msbuild'
-        elif (r := RE_USINGCMAKEMAKE.search(l)) or (r := RE_USINGCMAKERUNMAKE.search(l)):
+        elif ((l.startswith('[') and (r := RE_USINGCMAKEMAKE.match(l)))
+              or ('CMakeFiles' in l and (r := RE_USINGCMAKERUNMAKE.search(l)))):
             meta['buildsystem'] = 'cmake/make'
-        elif r := RE_USINGCMAKENINJA.search(l):
+        elif l.startswith('[') and (r := RE_USINGCMAKENINJA.match(l)):
             meta['buildsystem'] = 'cmake/ninja'
-        elif r := RE_USINGAUTOMAKE.search(l):
+        elif l.startswith('Making all in ') and (r := RE_USINGAUTOMAKE.match(l)):
             meta['buildsystem'] = 'automake'
-        elif r := RE_COMPILERPATHAC.search(l):
+        elif '--mode=compile ' in l and (r := RE_COMPILERPATHAC.search(l)):
             meta['compilerpath'] = r.group(1)
 
+    if buildcode_lines:
+        meta['buildcode'] = zlib.crc32(buildcode_lines)
+
     # Log major problems in parsing
     if 'testingver' not in meta:
         logging.debug('The file does not appear to be a curl test log')
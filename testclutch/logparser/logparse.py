@@ -1,8 +1,11 @@
 """Parse test logs."""
 
+import concurrent.futures
+import functools
 import importlib
 import logging
 import sys
+from typing import Callable, Iterable, Iterator
 
 from testclutch import config
 from testclutch import summarize
@@ -10,25 +13,40 @@ from testclutch.filedef import TextIOReadline
 from testclutch.logdef import ParsedLog
 
 
+@functools.lru_cache(maxsize=None)
+def parser_function(mod: str, func: str) -> Callable[[TextIOReadline], ParsedLog]:
+    """Return the log parsing function func in module mod.
+
+    The lookup is cached because it would otherwise be done for every parser for every log.
+    """
+    return getattr(importlib.import_module(mod), func)
+
+
+@functools.lru_cache(maxsize=None)
+def parser_names(log_parsers: tuple[str, ...]) -> tuple[tuple[str, str], ...]:
+    """Split the log_parsers config entries into module and function names.
+
+    This is cached so the entries are expanded, and any invalid ones logged, only once rather
+    than for every log. Invalid entries are skipped.
+    """
+    module_functions = [tuple(config.expandstr(p).rsplit('.', 1)) for p in log_parsers]
+    for m in module_functions:
+        if len(m) != 2:
+            logging.error('Invalid log_parsers entry %s; must have at least one dot', m[0])
+    return tuple(m for m in module_functions if len(m) == 2)
+
+
 def parse_log_file(f: TextIOReadline) -> ParsedLog:
     """Tries one or more methods to parse a log file and returns the first one that works.
 
     Returns: tuple of dict with metadata, list of tests
       If the test could not be parsed, the dict will be empty
     """
-    # Get a list of functions to use to parse
-    log_parsers = config.get('log_parsers')
-    module_functions = [tuple(config.expandstr(p).rsplit('.', 1)) for p in log_parsers]
-    errors = [m[0] for m in module_functions if len(m) != 2]
-    if errors:
-        for err in errors:
-            logging.error('Invalid log_parsers entry %s; must have at least one dot', err)
-
-    # Try all functions in order until one returns a result
-    for mod, func in module_functions:
+    meta, testcases = {}, []  # type: ParsedLog
+    # Try all configured functions in order until one returns a result
+    for mod, func in parser_names(tuple(config.get('log_parsers'))):
         logging.debug('Calling %s.%s()', mod, func)
-        module = importlib.import_module(mod)
-        meta, testcases = module.__dict__.get(func)(f)
+        meta, testcases = parser_function(mod, func)(f)
         if testcases:
             break
         f.seek(0)
@@ -39,6 +57,22 @@ def parse_log_file(f: TextIOReadline) -> ParsedLog:
     return meta, testcases
 
 
+def parse_log_path(path: str) -> ParsedLog:
+    """Open and parse the log file at the given path."""
+    with open(path) as f:
+        return parse_log_file(f)
+
+
+def parse_log_paths(paths: Iterable[str]) -> Iterator[ParsedLog]:
+    """Parse many log files, returning the results in the same order as the paths.
+
+    Parsing is CPU bound in Python code, so the files are parsed in separate processes to make
+    use of all the CPUs.
+    """
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        yield from executor.map(parse_log_path, paths, chunksize=4)
+
+
 # Debug interface
 def main():
     logging.basicConfig(level=logging.DEBUG, format='%(levelno)s %(filename)s: %(message)s',)
@@ -18,41 +18,62 @@ from testclutch.logparser import curlparse
 from testclutch.testcasedef import TestResult
 
 
+# These regexes are used with match(), which anchors them at the start of the line without
+# needing a ^, except for ASTROPY_PLATFORM_RE which may match anywhere in the line.
+
 # pytest -r A format
-SUMMARY_START_RE = re.compile(r'^={5,} short test summary info =+$')
+SUMMARY_START_RE = re.compile(r'={5,} short test summary info =+$')
 # uses SESSION_END_RE to end
-RESULT_RE = re.compile(r'^(\w+) (.*::\S*) *(- )?(.*)$')
-SKIPPED_RE = re.compile(r'^(\w+) \[\S*\] (\S*): (.*)$')
-NONVERBOSE_SENTINEL_RE = re.compile(r'^collected ([0-9]+) items$')
+RESULT_RE = re.compile(r'(\w+) (.*::\S*) *(- )?(.*)$')
+SKIPPED_RE = re.compile(r'(\w+) \[\S*\] (\S*): (.*)$')
+NONVERBOSE_SENTINEL_RE = re.compile(r'collected ([0-9]+) items$')
 # This is for xdist since NONVERBOSE_SENTINEL_RE doesn't appear
-NONVERBOSE_SENTINEL2_RE = re.compile(r'^[a-zA-Z.]* +\[100%\]$')
-SUMMARY_PLATFORM_RE = re.compile(r'^platform (\w+)( -- (.*))?$')
+NONVERBOSE_SENTINEL2_RE = re.compile(r'[a-zA-Z.]* +\[100%\]$')
+SUMMARY_PLATFORM_RE = re.compile(r'platform (\w+)( -- (.*))?$')
 
 # pytest -v format
-SESSION_END_RE = re.compile(r'^={3,} (\d+) (\w+).* in ([0-9.]+)s ([()\d:]+)? *=')
-RESULTV_RE = re.compile(r'^(?P<name>\S+::\S+(\[.+?\])?) (?P<result>\w+) +(\(.*\) +)?\[[ \d]+%\]$')
-VERBOSE_SENTINEL_RE = re.compile(r'^collecting \.\.\. collected ([0-9]+) items$')
+SESSION_END_RE = re.compile(r'={3,} (\d+) (\w+).* in ([0-9.]+)s ([()\d:]+)? *=')
+RESULTV_RE = re.compile(r'(?P<name>\S+::\S+(\[.+?\])?) (?P<result>\w+) +(\(.*\) +)?\[[ \d]+%\]$')
+VERBOSE_SENTINEL_RE = re.compile(r'collecting \.\.\. collected ([0-9]+) items$')
 # This is for xdist since VERBOSE_SENTINEL_RE doesn't appear
-VERBOSE_SENTINEL2_RE = re.compile(r'^cachedir: ')
-PLATFORM_RE = re.compile(r'^platform (\w+)( -- (.*) --)')
+VERBOSE_SENTINEL2_RE = re.compile(r'cachedir: ')
+PLATFORM_RE = re.compile(r'platform (\w+)( -- (.*) --)')
 
 # pytest -v format with xdist
 # This one shows up in the short output format as well
-XDIST_WORKERS_RE = re.compile(r'^([0-9]+) workers \[([0-9]+) items\]$')
-RESULTV_XDIST_RE = re.compile(r'^\[\w+\] \[ *\d+%\] (?P<result>\w+) (?P<name>\S+::\S+)$')
+XDIST_WORKERS_RE = re.compile(r'([0-9]+) workers \[([0-9]+) items\]$')
+RESULTV_XDIST_RE = re.compile(r'\[\w+\] \[ *\d+%\] (?P<result>\w+) (?P<name>\S+::\S+)$')
 
 # pytest-astropy-header --astropy-header option
-ASTROPY_PLATFORM_RE = re.compile(r'Platform: (.*)$')
-
-# curl-specific test headers
-# This provides the same information as ASTROPY_PLATFORM_RE
-CURL_PLATFORM_RE = re.compile(r'^ *platform: ([^ ]+)$')
-CURL_VERSION_RE = re.compile(r'^ *curl: Version: curl (?P<ver>[^ ]+) \([^)]+\)( (?P<deps>.*))?$')
-CURL_FEATURES_RE = re.compile(r'^ *curl: Features: (.*)$')
-CURL_PROTOCOLS_RE = re.compile(r'^ *curl: Protocols: (.*)$')
+ASTROPY_PLATFORM_RE = re.compile(r'Platform: (?P<platform>.*)$')
+
+# curl-specific test headers, combined into a single regex so a line needs only one match() to
+# find which kind it is. The name of the outer group of each alternative (available in
+# lastgroup) shows which one matched.
+# The platform line provides the same information as ASTROPY_PLATFORM_RE
+CURL_HEADER_RE = re.compile(
+    r' *(?:platform: (?P<platform>[^ ]+)$'
+    r'|(?P<version>curl: Version: curl (?P<ver>[^ ]+) \([^)]+\)( (?P<deps>.*))?$)'
+    r'|curl: Features: (?P<features>.*)$'
+    r'|curl: Protocols: (?P<protocols>.*)$)')
 
 # common lines
-SESSION_START_RE = re.compile(r'^={5,} test session starts =+$')
+SESSION_START_RE = re.compile(r'={5,} test session starts =+$')
+
+# Test result codes in the summary format. Skipped tests are shown differently and are matched by
+# SKIPPED_RE instead.
+SUMMARY_RESULTS = {
+    'PASSED': TestResult.PASS,
+    'FAILED': TestResult.FAIL,
+    'XPASS': TestResult.PASS,  # Treat this as a normal pass (it was expected to fail)
+    'XFAIL': TestResult.FAILIGNORE,
+}
+
+# Test result codes in the verbose format
+VERBOSE_RESULTS = {
+    **SUMMARY_RESULTS,
+    'SKIPPED': TestResult.SKIP,
+}
 
 # capture ANSI X3.64 escape sequences added with --color=yes
 STRIP_ANSI_RE = re.compile(
@@ -69,7 +90,9 @@ def strip_ansi(s: Optional[str]) -> Optional[str]:
 
     A None input is passed straight to the output.
     """
-    if not s:
+    # Nearly all lines have no escape sequences. Every character the regex can match is either
+    # ESC or a non-ASCII C1 control, and isascii() is a constant-time check.
+    if not s or (s.isascii() and '\x1b' not in s):
         return s
     return STRIP_ANSI_RE.sub('', s)
 
@@ -86,68 +109,64 @@ def parse_log_file_summary(f: TextIOReadline) -> ParsedLog:
     """
     meta = {}       # type: TestMeta
     testcases = []  # type: TestCases
-    while l := strip_ansi(f.readline()):
-        if SESSION_START_RE.search(l):
+    # A single line iterator, shared by the nested loops below, that strips escape sequences
+    # and then trailing white space
+    lines = map(str.rstrip, map(strip_ansi, iter(f.readline, '')))
+    for l in lines:
+        if l.startswith('=====') and SESSION_START_RE.match(l):
             logging.debug('Found the start of a pytest log')
             meta = {
                 'testformat': 'pytest',
                 'testresult': 'truncated',  # will be overwritten if the real end is found
             }
-            while l := strip_ansi(f.readline()):
-                l = l.rstrip()
-                if r := SUMMARY_PLATFORM_RE.search(l):
+            for l in lines:
+                # Cheap string checks are done before each regex, since most lines match none
+                if l.startswith('platform ') and (r := SUMMARY_PLATFORM_RE.match(l)):
                     meta['os'] = r.group(1)
                     meta['testdeps'] = r.group(3)
-                elif r := XDIST_WORKERS_RE.search(l):
+                elif ' workers [' in l and (r := XDIST_WORKERS_RE.match(l)):
                     # This shows up in short logs as well with xdist
                     meta['paralleljobs'] = r.group(1)
-                elif (r := ASTROPY_PLATFORM_RE.search(l)) or (r := CURL_PLATFORM_RE.search(l)):
-                    meta['pyplatform'] = r.group(1)
-                    platmeta = pyplatform.parse_platform(r.group(1))
-                    meta = {**meta, **platmeta}
-                elif r := CURL_VERSION_RE.search(l):
-                    meta['testingver'] = r.group('ver')
-                    meta['curldeps'] = r.group('deps')
-                elif r := CURL_FEATURES_RE.search(l):
-                    meta['features'] = r.group(1)
-                elif r := CURL_PROTOCOLS_RE.search(l):
-                    meta['curlprotocols'] = r.group(1)
+                elif (('Platform: ' in l and (r := ASTROPY_PLATFORM_RE.search(l)))
+                      or (('platform: ' in l or 'curl: ' in l)
+                          and (r := CURL_HEADER_RE.match(l)))):
+                    if (kind := r.lastgroup) == 'platform':
+                        meta['pyplatform'] = r.group('platform')
+                        platmeta = pyplatform.parse_platform(r.group('platform'))
+                        meta = {**meta, **platmeta}
+                    elif kind == 'version':
+                        meta['testingver'] = r.group('ver')
+                        meta['curldeps'] = r.group('deps')
+                    elif kind == 'features':
+                        meta['features'] = r.group('features')
+                    elif kind == 'protocols':
+                        meta['curlprotocols'] = r.group('protocols')
                 elif bimeta := curlparse.parse_buildinfo(l):
                     # curl-specific buildinfo lines
                     meta = {**meta, **bimeta}
-                elif VERBOSE_SENTINEL_RE.search(l) or VERBOSE_SENTINEL2_RE.search(l):  # noqa: R508
+                elif ((l.startswith('collecting ') and VERBOSE_SENTINEL_RE.match(l))  # noqa: R508
+                      or (l.startswith('cachedir: ') and VERBOSE_SENTINEL2_RE.match(l))):
                     # If this is found, this is a verbose log so clear data and give up
                     logging.debug("Actually, it's a verbose log; give up")
                     meta = {}
                     break
-                elif SUMMARY_START_RE.search(l):
+                elif l.startswith('=====') and SUMMARY_START_RE.match(l):
                     logging.debug('Found a pytest short log')
-                    while l := strip_ansi(f.readline()):
-                        l = l.rstrip()
-                        if r := SESSION_END_RE.search(l):
+                    for l in lines:
+                        if l.startswith('===') and (r := SESSION_END_RE.match(l)):
                             if r.group(2) == 'failed':
                                 meta['testresult'] = 'failure'
                             else:
                                 meta['testresult'] = 'success'
                             meta['runtestsduration'] = str(int(float(r.group(3)) * 1000000))
                             break
-                        elif r := RESULT_RE.search(l):
-                            if r.group(1) == 'PASSED':
-                                testcases.append(SingleTestFinding(
-                                    r.group(2), TestResult.PASS, r.group(4), 0))
-                            elif r.group(1) == 'FAILED':
-                                testcases.append(SingleTestFinding(
-                                    r.group(2), TestResult.FAIL, r.group(4), 0))
-                            elif r.group(1) == 'XPASS':
-                                # Treat this as a normal pass (it was expected to fail)
-                                testcases.append(SingleTestFinding(
-                                    r.group(2), TestResult.PASS, r.group(4), 0))
-                            elif r.group(1) == 'XFAIL':
+                        elif '::' in l and (r := RESULT_RE.match(l)):
+                            if (result := SUMMARY_RESULTS.get(r.group(1))) is not None:
                                 testcases.append(SingleTestFinding(
-                                    r.group(2), TestResult.FAILIGNORE, r.group(4), 0))
+                                    r.group(2), result, r.group(4), 0))
                             else:
                                 logging.error('Unknown pytest result: %s', r.group(1))
-                        elif r := SKIPPED_RE.search(l):
+                        elif ' [' in l and (r := SKIPPED_RE.match(l)):
                             if r.group(1) == 'SKIPPED':
                                 # The actual test name being skipped is not available here. The
                                 # name used here is an approximation that is good enough to
@@ -175,61 +194,59 @@ def parse_log_file(f: TextIOReadline) -> ParsedLog:
     """
     meta = {}       # type: TestMeta
     testcases = []  # type: TestCases
-    while l := strip_ansi(f.readline()):
-        if SESSION_START_RE.search(l):
+    # A single line iterator, shared by the nested loops below, that strips escape sequences
+    # and then trailing white space
+    lines = map(str.rstrip, map(strip_ansi, iter(f.readline, '')))
+    for l in lines:
+        if l.startswith('=====') and SESSION_START_RE.match(l):
             logging.debug('Found the start of a pytest log')
             meta = {
                 'testformat': 'pytest',
                 'testresult': 'truncated',  # will be overwritten if the real end is found
             }
-            while l := strip_ansi(f.readline()):
-                l = l.rstrip()
-                if r := SESSION_END_RE.search(l):
+            for l in lines:
+                # Cheap string checks are done before each regex, since most lines match none
+                if l.startswith('===') and (r := SESSION_END_RE.match(l)):
                     if r.group(2) == 'failed':
                         meta['testresult'] = 'failure'
                     else:
                         meta['testresult'] = 'success'
                     meta['runtestsduration'] = str(int(float(r.group(3)) * 1000000))
                     break
-                if r := PLATFORM_RE.search(l):
+                if l.startswith('platform ') and (r := PLATFORM_RE.match(l)):
                     meta['os'] = r.group(1)
                     meta['testdeps'] = r.group(3)
-                elif r := XDIST_WORKERS_RE.search(l):
+                elif ' workers [' in l and (r := XDIST_WORKERS_RE.match(l)):
                     meta['paralleljobs'] = r.group(1)
-                elif (r := ASTROPY_PLATFORM_RE.search(l)) or (r := CURL_PLATFORM_RE.search(l)):
-                    meta['pyplatform'] = r.group(1)
-                    platmeta = pyplatform.parse_platform(r.group(1))
-                    meta = {**meta, **platmeta}
-                elif r := CURL_VERSION_RE.search(l):
-                    meta['testingver'] = r.group('ver')
-                    meta['curldeps'] = r.group('deps')
-                elif r := CURL_FEATURES_RE.search(l):
-                    meta['features'] = r.group(1)
-                elif r := CURL_PROTOCOLS_RE.search(l):
-                    meta['curlprotocols'] = r.group(1)
+                elif (('Platform: ' in l and (r := ASTROPY_PLATFORM_RE.search(l)))
+                      or (('platform: ' in l or 'curl: ' in l)
+                          and (r := CURL_HEADER_RE.match(l)))):
+                    if (kind := r.lastgroup) == 'platform':
+                        meta['pyplatform'] = r.group('platform')
+                        platmeta = pyplatform.parse_platform(r.group('platform'))
+                        meta = {**meta, **platmeta}
+                    elif kind == 'version':
+                        meta['testingver'] = r.group('ver')
+                        meta['curldeps'] = r.group('deps')
+                    elif kind == 'features':
+                        meta['features'] = r.group('features')
+                    elif kind == 'protocols':
+                        meta['curlprotocols'] = r.group('protocols')
                 elif bimeta := curlparse.parse_buildinfo(l):
                     # curl-specific buildinfo lines
                     meta = {**meta, **bimeta}
-                elif (NONVERBOSE_SENTINEL_RE.search(l)  # noqa: R508
-                      or NONVERBOSE_SENTINEL2_RE.search(l)):
+                elif ((l.startswith('collected ')  # noqa: R508
+                       and NONVERBOSE_SENTINEL_RE.match(l))
+                      or (l.endswith('[100%]') and NONVERBOSE_SENTINEL2_RE.match(l))):
                     # If this is found, this is not a verbose log so clear data and give up
                     # Note that this does not appear with xdist
                     logging.debug("Actually, it's not a verbose log at all; give up")
                     meta = {}
                     break
-                elif (r := RESULTV_RE.search(l)) or (r := RESULTV_XDIST_RE.search(l)):
-                    if r.group('result') == 'PASSED':
-                        testcases.append(SingleTestFinding(r.group('name'), TestResult.PASS, '', 0))
-                    elif r.group('result') == 'FAILED':
-                        testcases.append(SingleTestFinding(r.group('name'), TestResult.FAIL, '', 0))
-                    elif r.group('result') == 'SKIPPED':
-                        testcases.append(SingleTestFinding(r.group('name'), TestResult.SKIP, '', 0))
-                    elif r.group('result') == 'XPASS':
-                        # Treat this as a normal pass (it was expected to fail)
-                        testcases.append(SingleTestFinding(r.group('name'), TestResult.PASS, '', 0))
-                    elif r.group('result') == 'XFAIL':
-                        testcases.append(SingleTestFinding(
-                            r.group('name'), TestResult.FAILIGNORE, '', 0))
+                elif '::' in l and ((r := RESULTV_RE.match(l))
+                                    or (r := RESULTV_XDIST_RE.match(l))):
+                    if (result := VERBOSE_RESULTS.get(r.group('result'))) is not None:
+                        testcases.append(SingleTestFinding(r.group('name'), result, '', 0))
                     else:
                         logging.error('Unknown pytest result: %s', r.group('result'))
 
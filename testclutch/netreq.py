@@ -4,8 +4,9 @@ import functools
 import logging
 import os
 import tempfile
+import threading
 import time
-from typing import Callable, Optional, Type
+from typing import Any, Callable, Hashable, Optional, Type
 
 import requests
 from requests import adapters
@@ -21,6 +22,19 @@ USER_AGENT = f'testclutch/{testclutch.__version__}'
 # Block size to download
 CHUNK_SIZE = 0x10000
 
+# Amount of downloaded data to accumulate before writing it out in a single system call
+WRITE_BATCH_SIZE = 0x400000
+
+# Maximum number of buffers that can be written in a single gathering write
+try:
+    WRITE_BATCH_BUFFERS = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    # sysconf isn't available on Windows
+    WRITE_BATCH_BUFFERS = 1024
+if WRITE_BATCH_BUFFERS <= 0:
+    # The limit is indeterminate; use the Linux value
+    WRITE_BATCH_BUFFERS = 1024
+
 
 def get(url: str, headers: Optional[dict[str, str]] = None, **args) -> requests.Response:
     """Perform an HTTP request with standard request headers if none are supplied."""
@@ -51,6 +65,42 @@ class Session(requests.Session):
         self.mount('http://', adapter)
 
 
+class TimedCache:
+    """Cache of API responses that expire after a fixed time.
+
+    This is intended to avoid repeating identical API queries within a single process. If two
+    threads look up the same missing key at once, both will perform the query. Expired entries
+    are removed whenever a new one is added, and at most maxsize entries are kept. The same
+    value object is returned to every caller, so callers must treat it as read-only.
+    """
+
+    def __init__(self, lifetime: float, maxsize: int = 16):
+        self.lifetime = lifetime
+        self.maxsize = maxsize
+        # Kept in the order the entries were fetched, oldest first
+        self.cache = {}  # type: dict[Hashable, tuple[float, Any]]
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Return the cached value for key, calling func to get it if missing or expired."""
+        now = time.monotonic()
+        with self.lock:
+            entry = self.cache.get(key)
+        if entry and now - entry[0] < self.lifetime:
+            return entry[1]
+
+        value = func()
+        with self.lock:
+            self.cache.pop(key, None)
+            # Remove stale entries, which are all at the start
+            for old_key, (fetched, _) in list(self.cache.items()):
+                if now - fetched < self.lifetime and len(self.cache) < self.maxsize:
+                    break
+                del self.cache[old_key]
+            self.cache[key] = (now, value)
+        return value
+
+
 # This could be replaced by the tenacity or backoff packages for more features
 def retry_on_exception(func: Callable, exception: Type[Exception],
                        retries: int = 10, delay: float = 10):
@@ -69,6 +119,26 @@ def retry_on_exception(func: Callable, exception: Type[Exception],
     raise exc
 
 
+def write_chunks(fd: int, chunks: list[bytes]):
+    """Write a list of data chunks to a file descriptor, bypassing Python's I/O buffering.
+
+    A single gathering write is used where the OS supports it.
+    """
+    if not hasattr(os, 'writev'):
+        # Windows doesn't support writev
+        for chunk in chunks:
+            os.write(fd, chunk)
+        return
+
+    written = os.writev(fd, chunks)
+    remaining = sum(len(chunk) for chunk in chunks) - written
+    if remaining:
+        # Partial write; write whatever is left over
+        data = memoryview(b''.join(chunks))[-remaining:]
+        while data:
+            data = data[os.write(fd, data):]
+
+
 def download_file_onetry(resp: requests.models.Response, url: str) -> tuple[str, str]:
     """Download the file at the link into a temporary file using the requests object.
 
@@ -77,10 +147,22 @@ def download_file_onetry(resp: requests.models.Response, url: str) -> tuple[str,
     resp.raise_for_status()
     with tempfile.NamedTemporaryFile(delete=False) as tmp:
         try:
+            fd = tmp.fileno()
+            buf = []
+            total = 0
             # In case of download error, this can raise the exception:
             #   requests.exceptions.ChunkedEncodingError: Response ended prematurely
             for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
-                tmp.write(chunk)
+                buf.append(chunk)
+                total += len(chunk)
+                # Chunks can be small with chunked transfer encoding, so the number of buffers
+                # is limited too
+                if total >= WRITE_BATCH_SIZE or len(buf) >= WRITE_BATCH_BUFFERS:
+                    write_chunks(fd, buf)
+                    buf.clear()
+                    total = 0
+            if buf:
+                write_chunks(fd, buf)
         except:  # noqa: E722
             # Delete the temporary file on exception
             os.unlink(tmp.name)
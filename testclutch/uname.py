@@ -2,6 +2,7 @@
 
 # flake8: noqa: C901, SIM114
 
+import functools
 import re
 
 from testclutch.logdef import TestMetaStr
@@ -9,9 +10,51 @@ from testclutch.logdef import TestMetaStr
 # Match a valid year since Linux was created, also 1970 in case of time issue
 LINUX_YEAR_RE = re.compile(r'^(20\d\d)|(199\d)|(1970)$')
 
+# Rules to find the architecture in the uname output of OSes that need nothing special.
+# Each rule is a tuple of: whether the output is split on every single space (keeping empty
+# fields) rather than on runs of whitespace, the numbers of fields for which the rule applies,
+# and the index of the field holding the architecture. The first matching rule is used.
+ARCH_RULES = {
+    # FreeBSD's hostname can be empty
+    'FreeBSD': ((True, frozenset((8, 15)), -1), (False, frozenset((8, 14, 15)), -1)),
+    'Darwin': ((False, frozenset((15,)), -1),),  # Darwin is macOS
+    'NetBSD': ((False, frozenset((15,)), -1),),
+    'OpenBSD': ((True, frozenset((5,)), -1),),
+    'Redox': ((True, frozenset((5,)), -1),),
+    'SerenityOS': ((True, frozenset((5,)), -1),),
+    'SunOS': ((True, frozenset((7, 8)), 5),),  # Solaris, OmniOS
+    # TODO: OS revision is in syspartsblanks[3], which perhaps should be appended to
+    # syspartsblanks[2] and go into meta['systemosver']. Take a look at how it presents
+    # itself once it comes out of beta.
+    'Haiku': ((True, frozenset((11,)), -2),),
+    'Minix': ((True, frozenset((7,)), -1),),
+    'Fiwix': ((True, frozenset((11,)), -2),),
+    'Zephyr': ((False, frozenset((10,)), -2),),
+    'QNX': ((False, frozenset((6,)), -1),),
+    'ELKS': ((False, frozenset((12,)), -1),),
+    'Tilck': ((False, frozenset((6,)), -2),),
+    'AROS': ((False, frozenset((9,)), -2),),
+}  # type: dict[str, tuple[tuple[bool, frozenset[int], int], ...]]
+
+# Windows-based environments, whose OS names include a version suffix
+WINDOWS_PREFIXES = ('MSYS_NT', 'MINGW32_NT', 'MINGW64_NT', 'CYGWIN_NT')
+# The version with 7 fields is missing the time zone
+WINDOWS_ARCH_RULES = ((False, frozenset((7, 8)), -2),)
+
 
 def parse_uname(uname: str) -> TestMetaStr:
     """Parse the output of 'uname -a' from many OSes for relevant data."""
+    # uname lines repeat across logs from the same CI machines, so the parse is cached. A new
+    # dict is returned each time since callers own (and may modify) the result.
+    return dict(_parse_uname_cached(uname))
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_uname_cached(uname: str) -> tuple[tuple[str, str], ...]:
+    return tuple(_parse_uname(uname).items())
+
+
+def _parse_uname(uname: str) -> TestMetaStr:
     meta = {}
 
     # This one treats multiple spaces as one separator (needed on Linux, NetBSD
@@ -33,72 +76,41 @@ def parse_uname(uname: str) -> TestMetaStr:
     meta['systemosver'] = syspartsblanks[2]
 
     # We can get more info on some OSes
-    if meta['systemos'] == 'Linux' and len(syspartsblanks) >= 12:
+    systemos = syspartsblanks[0]
+    if systemos == 'Linux' and len(syspartsblanks) >= 12:
         for i in range(9, len(syspartsblanks) - 2):
             if LINUX_YEAR_RE.match(syspartsblanks[i]):
                 # arch is found immediately after the kernel build year
                 meta['arch'] = syspartsblanks[i + 1]
                 break
-    elif meta['systemos'] == 'FreeBSD' and len(syspartsblanks) in {8, 15}:
-        meta['arch'] = syspartsblanks[-1]
-    elif meta['systemos'] == 'FreeBSD' and len(sysparts) in {8, 14, 15}:
-        meta['arch'] = sysparts[-1]
-    elif meta['systemos'] in {'Darwin', 'NetBSD'} and len(sysparts) == 15:  # Darwin is macOS
-        meta['arch'] = sysparts[-1]
-    elif meta['systemos'] == 'NetBSD' and len(sysparts) == 14 and 'systemhost' not in meta:
+    elif systemos == 'NetBSD' and len(sysparts) == 14 and 'systemhost' not in meta:
         # If the host field is blank, it shifts all the other parts down
         # one. The other systems use syspartsblank to avoid this problem,
         # but NetBSD embeds a date in its uname -a which can likely
         # contain an extra space which would cause THAT workaround to
         # fail.
         meta['arch'] = sysparts[-1]
-    elif meta['systemos'] in {'OpenBSD', 'Redox', 'SerenityOS'} and len(syspartsblanks) == 5:
-        meta['arch'] = syspartsblanks[-1]
-    elif meta['systemos'] == 'SunOS' and len(syspartsblanks) in {8, 7}:  # Solaris, OmniOS
-        meta['arch'] = syspartsblanks[5]
-    elif (meta['systemos'].startswith('MSYS_NT')
-          or meta['systemos'].startswith('MINGW32_NT')
-          or meta['systemos'].startswith('MINGW64_NT')
-          or meta['systemos'].startswith('CYGWIN_NT')) and len(sysparts) == 8:
-        meta['arch'] = sysparts[-2]
-    elif (meta['systemos'].startswith('MSYS_NT')
-          or meta['systemos'].startswith('MINGW32_NT')
-          or meta['systemos'].startswith('MINGW64_NT')
-          or meta['systemos'].startswith('CYGWIN_NT')) and len(sysparts) == 7:
-        # This version is missing the time zone
-        meta['arch'] = sysparts[-2]
-    elif meta['systemos'] == 'AIX' and len(sysparts) == 5:
+    elif systemos == 'AIX' and len(sysparts) == 5:
         # systemosver as set above is just the minor release number
         meta['systemosver'] = f'{sysparts[3]}.{sysparts[2]}'
-    elif meta['systemos'] == 'Haiku' and len(syspartsblanks) == 11:
-        meta['arch'] = syspartsblanks[-2]
-        # TODO: OS revision is in syspartsblanks[3], which perhaps should be appended to
-        # syspartsblanks[2] and go into meta['systemosver']. Take a look at how it presents
-        # itself once it comes out of beta.
-    elif meta['systemos'] == 'Minix' and len(syspartsblanks) == 7:
-        meta['arch'] = syspartsblanks[-1]
-    elif meta['systemos'] == 'Fiwix' and len(syspartsblanks) == 11:
-        meta['arch'] = syspartsblanks[-2]
-    elif meta['systemos'] == 'syllable' and len(syspartsblanks) == 6:
+    elif systemos == 'syllable' and len(syspartsblanks) == 6:
         # systemosver as set above is just the minor release number
         meta['systemosver'] = f'{sysparts[3]}.{sysparts[2]}'
         meta['arch'] = syspartsblanks[-2]
-    elif meta['systemos'] == 'NuttX' and len(sysparts) == 9:
+    elif systemos == 'NuttX' and len(sysparts) == 9:
         meta['arch'] = sysparts[-2]
         # This uname swaps the normal host and version fields
         meta['systemhost'] = syspartsblanks[2]
         meta['systemosver'] = syspartsblanks[1]
-    elif meta['systemos'] == 'Zephyr' and len(sysparts) == 10:
-        meta['arch'] = sysparts[-2]
-    elif meta['systemos'] == 'QNX' and len(sysparts) == 6:
-        meta['arch'] = sysparts[-1]
-    elif meta['systemos'] == 'ELKS' and len(sysparts) == 12:
-        meta['arch'] = sysparts[-1]
-    elif meta['systemos'] == 'Sortix' and len(sysparts) >= 11:
+    elif systemos == 'Sortix' and len(sysparts) >= 11:
         meta['arch'] = sysparts[-4]
-    elif meta['systemos'] == 'Tilck' and len(sysparts) == 6:
-        meta['arch'] = sysparts[-2]
-    elif meta['systemos'] == 'AROS' and len(sysparts) == 9:
-        meta['arch'] = sysparts[-2]
+    elif rules := ARCH_RULES.get(systemos,
+                                 WINDOWS_ARCH_RULES if systemos.startswith(WINDOWS_PREFIXES)
+                                 else ()):
+        for use_blanks, lengths, arch_index in rules:
+            parts = syspartsblanks if use_blanks else sysparts
+            if len(parts) in lengths:
+                meta['arch'] = parts[arch_index]
+                break
 
     return meta
@@ -4,6 +4,7 @@ This contains functions relating to source repositories but not CI services.
 """
 
 import contextlib
+import functools
 import logging
 import urllib.parse
 from typing import NamedTuple, Union
@@ -62,6 +63,8 @@ def url_host(url: str) -> str:
     return netloc.casefold()
 
 
+# Many CI runs refer to the same PR, so cache the results
+@functools.lru_cache(maxsize=512)
 def url_pr(url: str) -> int:
     """Extract the PR number from a GitHub URL.
 
@@ -3629,3 +3629,30 @@ class TestCurlParse(unittest.TestCase):
             SingleTestFinding('1', curlparse.TestResult.PASS, '', 1067000),
         ],
             testcases)
+
+    def test_resultline(self):
+        for line, kind in [
+                ('test 0001 SKIPPED: curl lacks debug support', 'skipped'),
+                ('test 0001...[HTTP GET]', 'teststart'),
+                ('test 0001...', 'teststartshort'),
+                (' 1: data FAILED', 'failed'),
+                (' 1: IGNORED: disabled', 'ignored'),
+                ('test 0001...OK (1   out of 1, remaining: 00:00, took 0.012s, duration: 00:00)',
+                 'testresultshort'),
+                ('test 0001...FAILED', 'testfailedshort'),
+                ('TESTDONE: 2 tests out of 2 reported OK: 100%', 'oksummary'),
+                ('TESTFAIL: These test cases failed: 1', 'failsummary'),
+                ('Warning: test1 result is ignored, but passed!', 'toignore'),
+                ('testcurl: enddate = Wed Jul  5 16:20:49 UTC 2023', 'enddate'),
+                ]:
+            with self.subTest(line=line):
+                self.assertEqual(kind, curlparse.RE_RESULTLINE.match(line).lastgroup)
+        self.assertIsNone(curlparse.RE_RESULTLINE.match('CMD (0): curl http://localhost/'))
+
+    def test_testcurl_timestamp(self):
+        self.assertEqual(1690652751, curlparse.testcurl_timestamp('Sat Jul 29 17:45:51 2023 UTC'))
+        self.assertEqual(1723012246, curlparse.testcurl_timestamp('Wed Aug  7 06:30:46 2024 UTC'))
+        # Not the usual format, so this is parsed by strptime
+        self.assertEqual(1690652751, curlparse.testcurl_timestamp('Sat Jul 29 17:45:51 2023+0000'))
+        with self.assertRaises(ValueError):
+            curlparse.testcurl_timestamp('Sat Jul 32 17:45:51 2023 UTC')
@@ -0,0 +1,38 @@
+"""Test ghaapi."""
+
+import unittest
+from unittest import mock
+
+from .context import testclutch  # noqa: F401
+
+from testclutch.ingest import ghaapi  # noqa: I100
+
+
+class TestGithubApi(unittest.TestCase):
+    """Test ghaapi.GithubApi."""
+
+    def setUp(self):
+        super().setUp()
+        ghaapi.runs_cache.cache.clear()
+        self.gh = ghaapi.GithubApi('owner', 'repo', None)
+
+    def tearDown(self):
+        ghaapi.runs_cache.cache.clear()
+        super().tearDown()
+
+    def test_get_runs_cached(self):
+        with mock.patch.object(self.gh, '_http_get_paged_json',
+                               return_value={'workflow_runs': []}) as get:
+            self.assertEqual({'workflow_runs': []}, self.gh.get_runs(branch='main'))
+            # A second object shares the cache
+            other = ghaapi.GithubApi('owner', 'repo', None)
+            self.assertEqual({'workflow_runs': []}, other.get_runs(branch='main'))
+            get.assert_called_once()
+
+    def test_get_runs_commit_not_cached(self):
+        with mock.patch.object(self.gh, '_http_get_paged_json',
+                               return_value={'workflow_runs': []}) as get:
+            self.gh.get_runs(head_sha='0123456789abcdef')
+            self.gh.get_runs(head_sha='0123456789abcdef')
+            self.assertEqual(2, get.call_count)
+        self.assertEqual({}, ghaapi.runs_cache.cache)
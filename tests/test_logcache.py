@@ -0,0 +1,106 @@
+"""Test logcache."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from .context import testclutch  # noqa: F401
+
+from testclutch import config     # noqa: I100
+from testclutch import logcache
+
+
+class TestLogCache(unittest.TestCase):
+    """Test logcache."""
+
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        # Replace XDG_CONFIG_HOME to prevent the user's testclutchrc file from being loaded
+        # and XDG_CACHE_HOME to put the log cache in a temporary location
+        self.env_patcher = mock.patch.dict(os.environ, {'XDG_CONFIG_HOME': '/dev/null',
+                                                        'XDG_CACHE_HOME': self.tmpdir.name})
+        self.env_patcher.start()
+        config.expand.cache_clear()
+        logcache.missing_cache.clear()
+        logcache.create_dirs('')
+
+    def tearDown(self):
+        self.env_patcher.stop()
+        config.expand.cache_clear()
+        self.tmpdir.cleanup()
+        super().tearDown()
+
+    def write_temp(self, data: bytes) -> str:
+        with tempfile.NamedTemporaryFile(dir=self.tmpdir.name, delete=False) as f:
+            f.write(data)
+        return f.name
+
+    def test_compressed(self):
+        lines = [f'Line {i} of the log file\n' for i in range(20000)]
+        content = ''.join(lines)
+        fn = self.write_temp(content.encode())
+        logcache.move_into_cache_compressed(fn, 'compressed.log')
+        self.assertFalse(os.path.exists(fn))
+        self.assertTrue(logcache.in_cache('compressed.log'))
+
+        with logcache.open_cache_file('compressed.log') as f:
+            self.assertEqual(lines[0], f.readline())
+            self.assertEqual(lines[1], f.readline())
+            # Read past the first decompressed block
+            self.assertEqual(lines[2:], f.readlines())
+            self.assertEqual('', f.readline())
+
+            # Rewind, like the log parsers do
+            f.seek(0)
+            self.assertEqual(content, f.read())
+
+    def test_uncompressed(self):
+        # Too short to compress
+        fn = self.write_temp(b'Short\n')
+        logcache.move_into_cache_compressed(fn, 'short.log')
+        self.assertTrue(logcache.in_cache('short.log'))
+        with logcache.open_cache_file('short.log') as f:
+            self.assertEqual('Short\n', f.read())
+
+    def test_not_in_cache(self):
+        self.assertFalse(logcache.in_cache('missing.log'))
+        with self.assertRaises(FileNotFoundError):
+            logcache.open_cache_file('missing.log')
+
+    def test_missing_cache(self):
+        self.assertFalse(logcache.in_cache('later.log'))
+        fn = self.write_temp(b'Later\n')
+        logcache.move_into_cache_compressed(fn, 'later.log')
+        self.assertTrue(logcache.in_cache('later.log'))
+
+    def test_in_cache_many(self):
+        logcache.create_dirs('sub')
+        fn = self.write_temp(b'Short\n')
+        logcache.move_into_cache_compressed(fn, 'sub/short.log')
+        fn = self.write_temp(b'Long\n' * 10000)
+        logcache.move_into_cache_compressed(fn, 'sub/long.log')
+        self.assertEqual({'sub/short.log': True,
+                          'sub/long.log': True,
+                          'sub/missing.log': False,
+                          'nodir/missing.log': False,
+                          },
+                         logcache.in_cache_many(['sub/short.log', 'sub/long.log',
+                                                 'sub/missing.log', 'nodir/missing.log']))
+
+    def test_move_many(self):
+        contents = [f'Log {i}\n'.encode() * 1000 for i in range(5)]
+        files = [(self.write_temp(data), f'many{i}.log') for i, data in enumerate(contents)]
+        logcache.move_many_into_cache_compressed(files)
+        for (fn, cachefn), data in zip(files, contents):
+            self.assertFalse(os.path.exists(fn))
+            with logcache.open_cache_file(cachefn) as f:
+                self.assertEqual(data.decode(), f.read())
+
+    def test_discard_many(self):
+        files = [(self.write_temp(b'Log'), f'discard{i}.log') for i in range(2)]
+        logcache.discard_many(files)
+        for fn, cachefn in files:
+            self.assertFalse(os.path.exists(fn))
+            self.assertFalse(logcache.in_cache(cachefn))
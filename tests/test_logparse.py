@@ -0,0 +1,45 @@
+"""Test logparse."""
+
+import os
+import unittest
+from unittest import mock
+
+from .context import testclutch  # noqa: F401
+
+from testclutch.logparser import logparse  # noqa: I100
+
+DATADIR = 'data'
+
+
+class TestLogParse(unittest.TestCase):
+    """Test logparse."""
+
+    def setUp(self):
+        super().setUp()
+        # Replace XDG_CONFIG_HOME to prevent the user's testclutchrc file from being loaded
+        self.env_patcher = mock.patch.dict(os.environ, {'XDG_CONFIG_HOME': '/dev/null'})
+        self.env_patcher.start()
+
+    def tearDown(self):
+        self.env_patcher.stop()
+        super().tearDown()
+
+    def data_path(self, fn: str) -> str:
+        return os.path.join(os.path.dirname(__file__), DATADIR, fn)
+
+    def test_parse_log_paths(self):
+        # The curl log isn't parsed by any of the default parsers
+        paths = [self.data_path(fn) for fn in ('pytest_success.log', 'automake_two.log',
+                                                'curlparse_short.log', 'pytest_verbose.log')]
+        expected = [logparse.parse_log_path(path) for path in paths]
+        self.assertEqual(['pytest', 'automake', None, 'pytest'],
+                         [meta.get('testformat') for meta, _ in expected])
+        self.assertEqual(expected, list(logparse.parse_log_paths(paths)))
+
+    def test_parser_names(self):
+        with self.assertLogs(level='ERROR'):
+            names = logparse.parser_names(('testclutch.logparser.curlparse.parse_log_file',
+                                           'nodots'))
+        self.assertEqual((('testclutch.logparser.curlparse', 'parse_log_file'),), names)
+        self.assertIs(logparse.parse_log_file,
+                      logparse.parser_function('testclutch.logparser.logparse', 'parse_log_file'))
@@ -53,3 +53,17 @@ class TestLogPrefix(unittest.TestCase):
             'Final\n'
         ],
             lines)
+
+    def test_regexprefixed_head_only(self):
+        infile = io.StringIO(textwrap.dedent("""\
+            12345 67890 First line
+            Second 12345 line
+        """))
+        # The pattern is not anchored but must still only be removed once at the head of the line
+        fixedprefixed = logprefix.RegexPrefixedLog(infile, regex=re.compile(r'[0-9]+ '))
+        lines = list(iter(fixedprefixed.readline, ''))
+        self.assertEqual([
+            '67890 First line\n',
+            'Second 12345 line\n',
+        ],
+            lines)
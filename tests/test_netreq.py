@@ -1,5 +1,7 @@
 """Test netreq."""
 
+import os
+import tempfile
 import time
 import unittest
 
@@ -43,3 +45,84 @@ class TestNetreq(unittest.TestCase):
         result = netreq.retry_on_exception(RaiseFirst(), RuntimeError, retries=100, delay=0.1)
         assert result == 2
         assert time.time() - start < 9, 'too many retries'
+
+    def test_download_file_onetry(self):
+        class FakeResponse:
+            headers = {'Content-Type': 'text/plain'}
+
+            def raise_for_status(self):
+                pass
+
+            def iter_content(self, chunk_size):
+                # Enough data to need more than one batched write
+                for i in range(3 * netreq.WRITE_BATCH_SIZE // chunk_size + 1):
+                    yield bytes([i % 256]) * chunk_size
+
+        name, content_type = netreq.download_file_onetry(FakeResponse(), 'http://localhost/')
+        try:
+            self.assertEqual('text/plain', content_type)
+            with open(name, 'rb') as f:
+                data = f.read()
+            expected = b''.join(FakeResponse().iter_content(netreq.CHUNK_SIZE))
+            self.assertEqual(expected, data)
+        finally:
+            os.unlink(name)
+
+    def test_download_file_onetry_tiny_chunks(self):
+        class FakeResponse:
+            headers = {}
+
+            def raise_for_status(self):
+                pass
+
+            def iter_content(self, chunk_size):
+                # More chunks than can be written in a single writev call
+                for i in range(3 * netreq.WRITE_BATCH_BUFFERS + 1):
+                    yield bytes([i % 256])
+
+        name, content_type = netreq.download_file_onetry(FakeResponse(), 'http://localhost/')
+        try:
+            self.assertEqual('application/octet-stream', content_type)
+            with open(name, 'rb') as f:
+                data = f.read()
+            expected = b''.join(FakeResponse().iter_content(1))
+            self.assertEqual(expected, data)
+        finally:
+            os.unlink(name)
+
+    def test_write_chunks(self):
+        with tempfile.TemporaryFile() as f:
+            netreq.write_chunks(f.fileno(), [b'abc', b'', b'defg'])
+            f.seek(0)
+            self.assertEqual(b'abcdefg', f.read())
+
+    def test_timed_cache(self):
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return len(calls)
+
+        cache = netreq.TimedCache(60)
+        self.assertEqual(1, cache.get('a', fetch))
+        self.assertEqual(1, cache.get('a', fetch))
+        self.assertEqual(2, cache.get('b', fetch))
+
+        # Everything expires immediately
+        cache = netreq.TimedCache(0)
+        self.assertEqual(3, cache.get('a', fetch))
+        self.assertEqual(4, cache.get('a', fetch))
+        # Stale entries are removed when a new one is added
+        self.assertEqual(5, cache.get('b', fetch))
+        self.assertEqual(['b'], list(cache.cache))
+
+    def test_timed_cache_limits(self):
+        cache = netreq.TimedCache(60, maxsize=2)
+        for key in 'abc':
+            cache.get(key, lambda: key)
+        # The oldest entry was dropped to make room
+        self.assertEqual(['b', 'c'], list(cache.cache))
+
+        # Every caller gets the same value without copying it
+        first = cache.get('list', lambda: {'runs': [1]})
+        self.assertIs(first, cache.get('list', lambda: {'runs': []}))
@@ -0,0 +1,45 @@
+"""Test prgha."""
+
+import unittest
+from unittest import mock
+
+from .context import testclutch  # noqa: F401
+
+from testclutch import logcache  # noqa: I100
+from testclutch.ingest import prgha
+
+
+class TestGithubAnalyzeJob(unittest.TestCase):
+    """Test prgha.GithubAnalyzeJob."""
+
+    def setUp(self):
+        super().setUp()
+        prgha.pr_head_cache.cache.clear()
+
+    def tearDown(self):
+        prgha.pr_head_cache.cache.clear()
+        super().tearDown()
+
+    def make_job(self):
+        with mock.patch.object(logcache, 'create_dirs'):
+            job = prgha.GithubAnalyzeJob('owner', 'repo', None, None)
+        job.gh = mock.Mock()
+        job.gh.get_pull.return_value = {'head': {'sha': '0123456789abcdef'}}
+        job.gh.get_runs.return_value = {'workflow_runs': []}
+        return job
+
+    def test_gather_pr_head_cached(self):
+        job = self.make_job()
+        self.assertEqual([], job.gather_pr(1234))
+        self.assertEqual([], job.gather_pr(1234))
+        job.gh.get_pull.assert_called_once_with(1234)
+        job.gh.get_runs.assert_called_with(head_sha='0123456789abcdef')
+
+        # A new object, as made for each PR analyzed, shares the cache
+        other = self.make_job()
+        other.gather_pr(1234)
+        other.gh.get_pull.assert_not_called()
+
+        # A different PR is looked up
+        other.gather_pr(1235)
+        other.gh.get_pull.assert_called_once_with(1235)
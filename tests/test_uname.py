@@ -343,3 +343,9 @@ class TestParseUname(unittest.TestCase):
         }, uname.parse_uname('xyzzy'))
         self.assertDictEqual({
         }, uname.parse_uname(''))
+
+    def test_cached_copy(self):
+        line = 'Linux myhost 5.15.0-1 #1 SMP Tue Jan 10 12:00:00 UTC 2023 x86_64 GNU/Linux'
+        first = uname.parse_uname(line)
+        first['systemos'] = 'changed'
+        self.assertEqual('Linux', uname.parse_uname(line)['systemos'])